@@ -0,0 +1,121 @@
+"""
+Startup benchmark checking how long importing echodata modules takes.
+
+Every module is imported in a fresh interpreter, several times, and the fastest import is compared
+against a time budget. The check also fails when a module pulls in a heavy dependency that it
+should only import on first use, e.g. `requests` for the token classes or pandas for anything
+but DataFrame output:
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --scale 2 --output import_times.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+from typing import Any, Dict, List, NamedTuple, Sequence
+
+HEAVY_MODULES = ('requests', 'pandas', 'pyarrow', 'httpx', 'msgspec', 'asyncio', 'multiprocessing')
+
+
+class Budget(NamedTuple):
+    """
+    The import budget of a module.
+
+    Attributes:
+        module (str): The module to import.
+        milliseconds (float): The maximum import time.
+        forbidden (Sequence[str]): Modules that must not be loaded by the import.
+    """
+    module: str
+    milliseconds: float
+    forbidden: Sequence[str] = HEAVY_MODULES
+
+
+BUDGETS = [
+    Budget('echodata', 5),
+    Budget('echodata.cli', 30),
+    Budget('echodata.linkedin.token', 40),
+    Budget('echodata.linkedin.auth', 40),
+    Budget('echodata.linkedin.token_store', 50),
+    Budget('echodata.linkedin.token_manager', 50),
+    Budget('echodata.linkedin.utils', 80),
+    Budget('echodata.linkedin.export', 100),
+    Budget('echodata.linkedin.frames', 100),
+    Budget('echodata.linkedin.jobs', 150, ('requests', 'pandas', 'pyarrow', 'httpx', 'msgspec'))
+]
+
+_PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'seconds': elapsed, 'modules': sorted(sys.modules)}}))
+'''
+
+
+def measure(module: str) -> Dict[str, Any]:
+    """
+    Import a module in a fresh interpreter.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        Dict[str, Any]: The import time in seconds and the names of all loaded modules.
+    """
+    output = subprocess.run([sys.executable, '-c', _PROBE.format(module=module)], check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def check(budgets: List[Budget], repeat: int, scale: float) -> List[Dict[str, Any]]:
+    """
+    Measure every budgeted module and compare it against its budget.
+
+    Args:
+        budgets (List[Budget]): The budgets to check.
+        repeat (int): Imports per module; the fastest one counts.
+        scale (float): Factor applied to every budget, e.g. for slow machines.
+
+    Returns:
+        List[Dict[str, Any]]: The result of every module.
+    """
+    results = []
+    for budget in budgets:
+        runs = [measure(budget.module) for _ in range(repeat)]
+        milliseconds = min(run['seconds'] for run in runs) * 1000
+        loaded = [name for name in budget.forbidden if name in runs[0]['modules']]
+        results.append({
+            'module': budget.module,
+            'milliseconds': milliseconds,
+            'budget': budget.milliseconds * scale,
+            'forbidden_loaded': loaded,
+            'ok': milliseconds <= budget.milliseconds * scale and not loaded
+        })
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Check the import time of echodata modules against budgets.')
+    parser.add_argument('--repeat', type=int, default=5, help='Imports per module; the fastest one counts.')
+    parser.add_argument('--scale', type=float, default=1.0, help='Factor applied to every budget.')
+    parser.add_argument('--output', help='Save the results as JSON.')
+    args = parser.parse_args()
+
+    results = check(BUDGETS, args.repeat, args.scale)
+    print(f"{'module':<36}{'ms':>8}{'budget':>8}  status")
+    for result in results:
+        status = 'ok' if result['ok'] else 'OVER BUDGET'
+        if result['forbidden_loaded']:
+            status = f"IMPORTS {', '.join(result['forbidden_loaded'])}"
+        print(f"{result['module']:<36}{result['milliseconds']:>8.1f}{result['budget']:>8.0f}  {status}")
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=4)
+    return 0 if all(result['ok'] for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
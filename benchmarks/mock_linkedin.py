@@ -0,0 +1,219 @@
+"""
+A local stand-in for the LinkedIn REST and OAuth endpoints used by the benchmarks.
+
+It serves deterministic paginated collections under `/rest/adAccounts`, `/rest/adCampaigns` and
+`/rest/adAnalytics`, token exchange and refresh under `/oauth/v2/accessToken`, and can add a fixed
+latency to every response and throttle every n-th request with `429 Too Many Requests`. A Rest.li
+`fields` projection restricts the returned elements to the selected fields, like the real API.
+
+Run it on its own with `python benchmarks/mock_linkedin.py --port 8000`.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+DEFAULT_TOTAL = 20000
+
+
+def make_element(collection: str, index: int) -> dict:
+    """
+    Build the element at an offset of a collection.
+
+    Args:
+        collection (str): The collection name, e.g. 'adCampaigns'.
+        index (int): The offset of the element.
+
+    Returns:
+        dict: An element shaped like the real API's.
+    """
+    if collection == 'adAnalytics':
+        return {
+            'pivotValues': [f'urn:li:sponsoredCampaign:{index % 500}'],
+            'dateRange': {'start': {'year': 2024, 'month': 1 + index % 12, 'day': 1 + index % 28}},
+            'impressions': index * 7 % 10000,
+            'clicks': index % 97,
+            'costInLocalCurrency': f'{index % 1000 / 10:.2f}'
+        }
+    return {
+        'id': index,
+        'name': f'{collection} {index}',
+        'account': f'urn:li:sponsoredAccount:{index % 100}',
+        'campaignGroup': f'urn:li:sponsoredCampaignGroup:{index % 50}',
+        'status': 'ACTIVE',
+        'type': 'TEXT_AD',
+        'costType': 'CPM',
+        'objectiveType': 'WEBSITE_VISIT',
+        'locale': {'country': 'US', 'language': 'en'},
+        'runSchedule': {'start': 1700000000000 + index, 'end': 1800000000000 + index},
+        'dailyBudget': {'amount': f'{index % 500}.00', 'currencyCode': 'USD'},
+        'unitCost': {'amount': f'{index % 20}.50', 'currencyCode': 'USD'},
+        'targetingCriteria': {'include': {'and': [
+            {'or': {'urn:li:adTargetingFacet:locations': ['urn:li:geo:103644278', 'urn:li:geo:101174742']}},
+            {'or': {'urn:li:adTargetingFacet:industries': [f'urn:li:industry:{index % 150}']}}
+        ]}},
+        'servingStatuses': ['RUNNABLE'],
+        'version': {'versionTag': str(index % 7)},
+        'changeAuditStamps': {'created': {'time': 1700000000000 + index}, 'lastModified': {'time': 1710000000000 + index}}
+    }
+
+
+def parse_projection(text: str) -> dict:
+    """
+    Parse a Rest.li projection such as `id,dailyBudget:(amount)` into a tree of selected fields.
+
+    Returns:
+        dict: The selected fields, mapping to the tree of their selected subfields or to None.
+    """
+    def parse(position: int):
+        tree, name = {}, ''
+        while position < len(text):
+            char = text[position]
+            if char == ':' and text[position + 1] == '(':
+                tree[name], position = parse(position + 2)
+                name = ''
+            elif char == ',':
+                if name:
+                    tree[name] = None
+                name = ''
+            elif char == ')':
+                if name:
+                    tree[name] = None
+                return tree, position
+            else:
+                name += char
+            position += 1
+        if name:
+            tree[name] = None
+        return tree, position
+    return parse(0)[0]
+
+
+def project(value, tree):
+    """
+    Keep only the fields of a projection tree.
+    """
+    if tree is None or not isinstance(value, dict):
+        return value
+    return {name: project(value[name], subtree) for name, subtree in tree.items() if name in value}
+
+
+class MockLinkedInHandler(BaseHTTPRequestHandler):
+    """
+    Request handler emulating the LinkedIn API. Behaviour is configured on the server object.
+    """
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without TCP_NODELAY keep-alive clients stall on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _throttled(self) -> bool:
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            count = server.requests
+        if server.latency:
+            time.sleep(server.latency)
+        if server.throttle_every and count % server.throttle_every == 0:
+            self._send_json(429, {'message': 'Resource level throttle limit reached'}, {'Retry-After': '0'})
+            return True
+        return False
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        if self._throttled():
+            return
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        collection = url.path.rsplit('/', 1)[-1]
+        if not url.path.startswith('/rest/') or collection not in ('adAccounts', 'adCampaigns', 'adAnalytics'):
+            self._send_json(404, {'message': 'Not found'})
+            return
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            self._send_json(401, {'message': 'Unauthorized'})
+            return
+        total = self.server.total
+        start = int(params.get('start', 0))
+        count = int(params.get('count', 1000))
+        elements = [make_element(collection, index) for index in range(start, min(start + count, total))]
+        if params.get('fields'):
+            tree = parse_projection(params['fields'])
+            elements = [project(element, tree) for element in elements]
+        self._send_json(200, {'elements': elements, 'paging': {'start': start, 'count': count, 'total': total}})
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        length = int(self.headers.get('Content-Length', 0))
+        form = dict(parse_qsl(self.rfile.read(length).decode()))
+        if self._throttled():
+            return
+        if self.path not in ('/oauth/v2/accessToken', '/oauth/v2/revoke'):
+            self._send_json(404, {'message': 'Not found'})
+            return
+        if self.path.endswith('/revoke'):
+            self._send_json(200, {})
+            return
+        self._send_json(200, {
+            'access_token': f"token-{form.get('refresh_token', form.get('code', ''))}-{time.time()}",
+            'expires_in': 5184000,
+            'refresh_token': 'refresh-token',
+            'refresh_token_expires_in': 31536000,
+            'scope': 'r_ads_reporting,r_ads'
+        })
+
+
+def start_server(port: int = 0, total: int = DEFAULT_TOTAL, latency: float = 0.0,
+                 throttle_every: int = 0) -> ThreadingHTTPServer:
+    """
+    Start the mock server on a background thread.
+
+    Args:
+        port (int): The port to listen on, or 0 for any free port.
+        total (int): Number of elements in every paginated collection.
+        latency (float): Seconds added to every response.
+        throttle_every (int): Answer every n-th request with 429, or 0 to never throttle.
+
+    Returns:
+        ThreadingHTTPServer: The running server; its port is `server.server_port`.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), MockLinkedInHandler)
+    server.daemon_threads = True
+    server.total = total
+    server.latency = latency
+    server.throttle_every = throttle_every
+    server.requests = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local stand-in for the LinkedIn API.')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--total', type=int, default=DEFAULT_TOTAL, help='Elements per paginated collection.')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response.')
+    parser.add_argument('--throttle-every', type=int, default=0, help='Answer every n-th request with 429.')
+    args = parser.parse_args()
+    server = start_server(args.port, args.total, args.latency, args.throttle_every)
+    print(f'Serving on http://127.0.0.1:{server.server_port}')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
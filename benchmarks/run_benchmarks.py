@@ -0,0 +1,249 @@
+"""
+Offline benchmarks of the echodata request, pagination, token and export paths.
+
+The benchmarks run against the local stand-in server of `mock_linkedin.py`, started in a separate
+process, and report throughput, p50/p99 request latency and peak Python memory for every case.
+Results can be saved as JSON and compared against a saved baseline to catch regressions:
+
+    python benchmarks/run_benchmarks.py --output baseline.json
+    python benchmarks/run_benchmarks.py --compare baseline.json --tolerance 0.2
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from mock_linkedin import DEFAULT_TOTAL, start_server
+
+
+def _serve(connection, total: int, latency: float, throttle_every: int) -> None:
+    """
+    Run a mock server in a child process and report its port through the connection.
+    """
+    server = start_server(0, total, latency, throttle_every)
+    connection.send(server.server_port)
+    connection.recv()  # Block until the parent asks us to stop
+    server.shutdown()
+
+
+class MockServerProcess:
+    """
+    Runs the mock server in its own process so it does not compete with the client for the GIL.
+    """
+
+    def __init__(self, total: int, latency: float, throttle_every: int = 0):
+        self._parent, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve, args=(child, total, latency, throttle_every),
+                                                daemon=True)
+        self._process.start()
+        self.port = self._parent.recv()
+        self.url = f'http://127.0.0.1:{self.port}'
+
+    def stop(self) -> None:
+        self._parent.send('stop')
+        self._process.join(5)
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """
+    Compute a percentile with linear interpolation.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def measure(name: str, func: Callable[[], int], repeat: int) -> Dict[str, Any]:
+    """
+    Run a benchmark case: once under tracemalloc for peak memory, then `repeat` timed runs.
+
+    Args:
+        name (str): The name of the case.
+        func (Callable[[], int]): Runs the case once and returns the number of items processed.
+        repeat (int): Number of timed runs.
+
+    Returns:
+        Dict[str, Any]: Throughput, wall time, request latency percentiles and peak memory.
+
+    Raises:
+        RuntimeError: If the case sent no request that emitted a 'request' event, so there is no latency to report.
+    """
+    from echodata.common.metrics import add_hook, remove_hook  # pylint: disable=import-outside-toplevel
+
+    tracemalloc.start()
+    func()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    latencies: List[float] = []
+    received = 0
+
+    def on_request(elapsed: float, bytes_received: int = 0, **_: Any) -> None:
+        nonlocal received
+        latencies.append(elapsed)
+        received += bytes_received
+
+    add_hook('request', on_request)
+    durations, items = [], 0
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            items = func()
+            durations.append(time.perf_counter() - started)
+    finally:
+        remove_hook('request', on_request)
+    if not latencies:
+        raise RuntimeError(f"The {name} case sent no instrumented requests.")
+
+    wall = statistics.median(durations)
+    return {
+        'name': name,
+        'items': items,
+        'seconds': wall,
+        'throughput': items / wall if wall else None,
+        'requests': len(latencies) // max(repeat, 1),
+        'bytes_per_item': received // max(repeat, 1) / items if items else None,
+        'p50_ms': (percentile(latencies, 0.5) or 0) * 1000,
+        'p99_ms': (percentile(latencies, 0.99) or 0) * 1000,
+        'peak_memory_mb': peak_memory / 2 ** 20
+    }
+
+
+def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """
+    Start the mock servers, point echodata at them and run every benchmark case.
+    """
+    server = MockServerProcess(args.total, args.latency)
+    throttled_server = MockServerProcess(args.total, args.latency, throttle_every=args.throttle_every)
+    os.environ['ECHODATA_LINKEDIN_API_URL'] = f'{server.url}/rest'
+    os.environ['ECHODATA_LINKEDIN_OAUTH_URL'] = f'{server.url}/oauth/v2'
+
+    # echodata reads the base URLs on import, so it is only imported once they are set
+    # pylint: disable=import-outside-toplevel
+    from echodata.common.export import export_elements
+    from echodata.linkedin import utils
+    from echodata.linkedin.token import LinkedInToken
+
+    token = 'benchmark-token'
+    params = {'q': 'search'}
+
+    def paginate(max_workers: int) -> Callable[[], int]:
+        return lambda: len(utils.linkedin_paginated_request('/adCampaigns', token, params, max_workers=max_workers))
+
+    def projected() -> int:
+        fields = ['id', 'name', 'status', 'dailyBudget.amount']
+        return sum(1 for _ in utils.iter_linkedin_elements('/adCampaigns', token, params, fields=fields))
+
+    def stream() -> int:
+        return sum(1 for _ in utils.iter_linkedin_elements('/adCampaigns', token, params))
+
+    def throttled() -> int:
+        utils.LINKEDIN_API_URL = f'{throttled_server.url}/rest'
+        try:
+            return len(utils.linkedin_paginated_request('/adCampaigns', token, params, max_workers=4))
+        finally:
+            utils.LINKEDIN_API_URL = f'{server.url}/rest'
+
+    def refresh() -> int:
+        linkedin_token = LinkedInToken('r_ads', 'value', str(time.time()), 'refresh', str(time.time() + 3600))
+        for _ in range(args.refreshes):
+            linkedin_token.refresh_access_token('client-id', 'client-secret')
+        return args.refreshes
+
+    def export(fmt: str) -> Callable[[], int]:
+        def run_export() -> int:
+            with tempfile.TemporaryDirectory() as directory:
+                elements = utils.iter_linkedin_elements('/adCampaigns', token, params)
+                return export_elements(elements, os.path.join(directory, f'report.{fmt}'), fmt=fmt, chunk_size=5000)
+        return run_export
+
+    cases = [
+        ('pagination_sequential', paginate(1)),
+        ('pagination_parallel_8', paginate(8)),
+        ('pagination_streaming', stream),
+        ('pagination_projected', projected),
+        ('pagination_throttled', throttled),
+        ('token_refresh', refresh),
+        ('export_ndjson', export('ndjson')),
+        ('export_csv', export('csv'))
+    ]
+    try:
+        import pyarrow  # noqa: F401  pylint: disable=unused-import
+        cases.append(('export_parquet', export('parquet')))
+    except ImportError:
+        pass
+
+    try:
+        return [measure(name, func, args.repeat) for name, func in cases if not args.only or name in args.only]
+    finally:
+        server.stop()
+        throttled_server.stop()
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, tolerance: float) -> List[str]:
+    """
+    Compare results with a saved baseline.
+
+    Returns:
+        List[str]: A description of every case whose throughput dropped or whose peak memory grew beyond the tolerance.
+    """
+    with open(baseline_path, 'r') as baseline_file:
+        baseline = {result['name']: result for result in json.load(baseline_file)}
+    regressions = []
+    for result in results:
+        previous = baseline.get(result['name'])
+        if previous is None:
+            continue
+        if result['throughput'] < previous['throughput'] * (1 - tolerance):
+            regressions.append(f"{result['name']}: throughput {result['throughput']:.0f}/s, "
+                               f"baseline {previous['throughput']:.0f}/s")
+        if result['peak_memory_mb'] > previous['peak_memory_mb'] * (1 + tolerance) + 1:
+            regressions.append(f"{result['name']}: peak memory {result['peak_memory_mb']:.1f} MB, "
+                               f"baseline {previous['peak_memory_mb']:.1f} MB")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark echodata against a local mock LinkedIn server.')
+    parser.add_argument('--total', type=int, default=DEFAULT_TOTAL, help='Elements per paginated collection.')
+    parser.add_argument('--latency', type=float, default=0.005, help='Seconds of server latency per response.')
+    parser.add_argument('--throttle-every', type=int, default=5, help='Throttle every n-th request in the throttled case.')
+    parser.add_argument('--refreshes', type=int, default=200, help='Token refreshes per run.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case.')
+    parser.add_argument('--only', nargs='*', help='Names of the cases to run.')
+    parser.add_argument('--output', help='Save the results as JSON.')
+    parser.add_argument('--compare', help='Compare with a baseline saved with --output.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative regression.')
+    args = parser.parse_args()
+
+    results = run(args)
+    print(f"{'case':<24}{'items':>9}{'seconds':>10}{'items/s':>12}{'requests':>10}{'B/item':>8}{'p50 ms':>9}"
+          f"{'p99 ms':>9}{'peak MB':>9}")
+    for result in results:
+        print(f"{result['name']:<24}{result['items']:>9}{result['seconds']:>10.3f}{result['throughput']:>12.0f}"
+              f"{result['requests']:>10}{result['bytes_per_item'] or 0:>8.0f}{result['p50_ms']:>9.1f}"
+              f"{result['p99_ms']:>9.1f}{result['peak_memory_mb']:>9.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=4)
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
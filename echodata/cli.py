@@ -0,0 +1,57 @@
+"""
+This module implements the `echodata` command line interface.
+"""
+import argparse
+import logging
+import sys
+from typing import List, Optional
+
+
+def _run_jobs(args: argparse.Namespace) -> int:
+    """
+    Run the jobs of a job spec file.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+
+    Returns:
+        int: The exit code, non-zero if any job failed.
+    """
+    from .linkedin.jobs import load_jobs, run_jobs  # pylint: disable=import-outside-toplevel
+
+    statuses = run_jobs(load_jobs(args.spec), args.status_dir, token_store_path=args.tokens,
+                        max_workers=args.workers, application_rate=args.app_rate,
+                        application_burst=args.app_burst, member_rate=args.member_rate)
+    return 1 if any(status['status'] != 'ok' for status in statuses) else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Parse the command line and run the requested command.
+
+    Args:
+        argv (List[str], optional): The arguments, defaulting to `sys.argv[1:]`.
+
+    Returns:
+        int: The exit code.
+    """
+    parser = argparse.ArgumentParser(prog='echodata', description='LinkedIn analytics and reporting toolkit.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    jobs_parser = commands.add_parser('run-jobs', help='Export many reports on a pool of worker processes.')
+    jobs_parser.add_argument('spec', help='Path of the JSON job spec.')
+    jobs_parser.add_argument('--tokens', help='Path of the token store holding the jobs\' tokens: a JSON file, or a .db/.sqlite database.')
+    jobs_parser.add_argument('--status-dir', default='status', help='Directory receiving the job status files.')
+    jobs_parser.add_argument('--workers', type=int, help='Number of worker processes (default: number of CPUs).')
+    jobs_parser.add_argument('--app-rate', type=float, help='Requests per second allowed across all workers.')
+    jobs_parser.add_argument('--app-burst', type=float, help='Burst size of the shared rate limit.')
+    jobs_parser.add_argument('--member-rate', type=float, help='Requests per second allowed per member within each worker.')
+    jobs_parser.set_defaults(handler=_run_jobs)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+This module provides the asyncio counterparts of the HTTP helpers in `echodata.common.utils`.
+
+Requests are sent through a pooled `httpx.AsyncClient` shared by all tasks of an event loop,
+and a semaphore caps how many of them may be in flight at once. httpx is an optional
+dependency; install it with `pip install echodata[async]`.
+"""
+import asyncio
+import functools
+import logging
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Collection, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - depends on the installed extras
+    httpx = None
+
+from .metrics import emit, exception_endpoint
+from .ratelimit import RETRYABLE_STATUSES, RetryBudget, get_retry_budget, retry_delay
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_CONCURRENCY = 50
+
+_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]' = weakref.WeakKeyDictionary()
+_semaphores: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = weakref.WeakKeyDictionary()
+_concurrency = DEFAULT_CONCURRENCY
+
+
+def _require_httpx() -> None:
+    """
+    Make sure the optional httpx dependency is installed.
+
+    Raises:
+        ImportError: If httpx is not installed.
+    """
+    if httpx is None:
+        raise ImportError("The asyncio API requires httpx. Install it with `pip install echodata[async]`.")
+
+
+def create_async_client(max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+                        headers: Optional[Dict[str, str]] = None) -> 'httpx.AsyncClient':
+    """
+    Create a new asynchronous HTTP client with a keep-alive connection pool.
+
+    Args:
+        max_connections (int): Maximum number of open connections.
+        max_keepalive_connections (int): Maximum number of idle connections kept alive.
+        headers (Dict[str, str], optional): Default headers sent with every request of the client.
+
+    Returns:
+        httpx.AsyncClient: The configured client.
+    """
+    _require_httpx()
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+    return httpx.AsyncClient(limits=limits, headers=headers)
+
+
+def get_async_client() -> 'httpx.AsyncClient':
+    """
+    Get the client shared by the running event loop, creating it on first use.
+
+    Returns:
+        httpx.AsyncClient: The shared client.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = create_async_client()
+    return client
+
+
+def set_async_client(client: 'httpx.AsyncClient') -> None:
+    """
+    Replace the client shared by the running event loop.
+
+    Args:
+        client (httpx.AsyncClient): The new shared client.
+    """
+    _clients[asyncio.get_running_loop()] = client
+
+
+async def close_async_client() -> None:
+    """
+    Close the client shared by the running event loop and release its pooled connections.
+    """
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def set_async_concurrency(limit: int) -> None:
+    """
+    Cap the number of asynchronous requests that may be in flight at the same time.
+
+    The new limit applies to event loops that have not sent a request yet.
+
+    Args:
+        limit (int): Maximum number of concurrent requests per event loop.
+
+    Raises:
+        ValueError: If the limit is smaller than 1.
+    """
+    global _concurrency
+    if limit < 1:
+        raise ValueError("The concurrency limit must be at least 1.")
+    _concurrency = limit
+    _semaphores.clear()
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """
+    Get the concurrency semaphore of the running event loop.
+
+    Returns:
+        asyncio.Semaphore: The semaphore bounding in-flight requests.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(_concurrency)
+    return semaphore
+
+
+async def async_make_request(url: str, method: str = 'GET', headers: Optional[Dict[str, str]] = None,
+                             data: Optional[Any] = None, params: Optional[Dict[str, str]] = None,
+                             timeout: int = 30, client: Optional['httpx.AsyncClient'] = None,
+                             raise_for_status: bool = True) -> 'httpx.Response':
+    """
+    Make an asynchronous HTTP request to a specified URL and return the raw response.
+
+    Args:
+        url (str): The URL to which the request is to be made.
+        method (str): The HTTP method, e.g., 'GET', 'POST', etc.
+        headers (Dict[str, str], optional): HTTP headers to send with the request.
+        data (Any, optional): Form data to send with the request.
+        params (Dict[str, str], optional): URL parameters to append to the URL.
+        timeout (int): Timeout for the request in seconds.
+        client (httpx.AsyncClient, optional): The client to send the request with.
+        raise_for_status (bool): Whether an unsuccessful status raises, or the response is returned for
+            the caller to inspect.
+
+    Returns:
+        httpx.Response: The response object.
+
+    Raises:
+        httpx.HTTPError: For any issues with the request.
+    """
+    client = client or get_async_client()
+    started = time.perf_counter()
+    response = error = None
+    try:
+        async with _get_semaphore():
+            response = await client.request(method, url, headers=headers, data=data, params=params, timeout=timeout)
+        if raise_for_status:
+            response.raise_for_status()
+        return response
+    except httpx.HTTPError as e:
+        # Handle any errors that occur during the request
+        error = str(e)
+        logger.warning("%s %s failed: %s", method, url, e)
+        raise
+    finally:
+        emit('request', method=method, endpoint=urlsplit(url).path, host=urlsplit(url).hostname,
+             status=response.status_code if response is not None else None, elapsed=time.perf_counter() - started,
+             bytes_received=len(response.content) if response is not None else 0, error=error)
+
+
+T = TypeVar('T')  # Generic type for decorator
+
+
+def async_retry(max_retries: int = 3, delay: float = 1, exceptions: tuple = (Exception,), max_delay: float = 60,
+                statuses: Collection[int] = RETRYABLE_STATUSES, budget: Optional[RetryBudget] = None) \
+        -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    A decorator that retries a coroutine function upon specified exceptions.
+
+    This is the asyncio counterpart of `echodata.common.utils.retry` and shares its backoff,
+    `Retry-After` handling and retry budget.
+
+    Args:
+        max_retries (int): Maximum number of attempts.
+        delay (float): Base delay between retries in seconds.
+        exceptions (tuple): Exceptions to catch and retry on.
+        max_delay (float): Upper bound of the backoff in seconds.
+        statuses (Collection[int]): HTTP statuses worth retrying when an exception carries a response.
+        budget (RetryBudget, optional): The retry budget to spend from. Defaults to the shared budget.
+
+    Returns:
+        Callable: Decorated coroutine function that will retry upon specified exceptions.
+    """
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            attempt = 0
+            while True:
+                try:
+                    result = await func(*args, **kwargs)
+                except exceptions as e:
+                    logger.warning("Attempt %d/%d of %s failed: %s", attempt + 1, max_retries, func.__name__, e)
+                    wait = retry_delay(e, attempt, max_retries, delay, max_delay, statuses, budget)
+                    if wait is None:
+                        raise  # Re-raise the last exception if it cannot be retried
+                    logger.info("Retrying %s in %.2f seconds.", func.__name__, wait)
+                    emit('retry', function=func.__name__, endpoint=exception_endpoint(e, func.__name__),
+                         attempt=attempt + 1, delay=wait, error=str(e))
+                    await asyncio.sleep(wait)
+                    attempt += 1
+                else:
+                    (budget or get_retry_budget()).record_success()
+                    return result
+        return wrapper
+    return decorator
@@ -0,0 +1,265 @@
+"""
+This module provides response caches for GET requests to mostly static resources.
+
+Entries are keyed by URL, parameters and the identity of the access token, expire after a
+configurable time to live and are evicted least-recently-used first once the cache is full.
+Stale entries that carry an ETag are revalidated with a conditional request, so an unchanged
+resource costs a `304 Not Modified` instead of a full download. Two backends are available:
+an in-memory cache and an on-disk cache backed by sqlite.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, NamedTuple, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    import httpx
+    import requests
+
+DEFAULT_TTL = 300
+DEFAULT_MAXSIZE = 1024
+
+
+class CacheEntry(NamedTuple):
+    """
+    A cached HTTP response.
+
+    Attributes:
+        status_code (int): The HTTP status of the response.
+        headers (Dict[str, str]): The response headers.
+        content (bytes): The response body.
+        etag (str): The ETag of the response, if any.
+        expires_at (float): The Unix timestamp after which the entry must be revalidated.
+    """
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    etag: Optional[str]
+    expires_at: float
+
+    @property
+    def is_fresh(self) -> bool:
+        """
+        Check whether the entry can be used without asking the server.
+
+        Returns:
+            bool: True if the entry has not expired yet, False otherwise.
+        """
+        return time.time() < self.expires_at
+
+    def to_response(self) -> 'requests.Response':
+        """
+        Rebuild a response object from the entry.
+
+        Returns:
+            requests.Response: A response carrying the cached status, headers and body.
+        """
+        import requests  # pylint: disable=import-outside-toplevel,redefined-outer-name
+        from requests.structures import CaseInsensitiveDict  # pylint: disable=import-outside-toplevel
+
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content  # pylint: disable=protected-access
+        return response
+
+    def to_async_response(self, url: str) -> 'httpx.Response':
+        """
+        Rebuild an `httpx` response object from the entry, for the asyncio API.
+
+        Args:
+            url (str): The URL of the cached request.
+
+        Returns:
+            httpx.Response: A response carrying the cached status, headers and body.
+        """
+        import httpx  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        return httpx.Response(self.status_code, headers=self.headers, content=self.content,
+                              request=httpx.Request('GET', url))
+
+
+def cache_key(url: str, params: Optional[Any] = None, access_token: Optional[str] = None) -> str:
+    """
+    Build the cache key of a request.
+
+    The access token is hashed so that raw credentials never end up in the cache.
+
+    Args:
+        url (str): The requested URL.
+        params (Any, optional): The URL parameters of the request.
+        access_token (str, optional): The access token the request is sent with.
+
+    Returns:
+        str: A stable key identifying the request.
+    """
+    token_id = hashlib.sha256(access_token.encode()).hexdigest()[:16] if access_token else ''
+    raw = json.dumps([url, params, token_id], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ResponseCache(ABC):
+    """
+    Abstract base class for response caches.
+
+    Attributes:
+        ttl (float): Seconds a cached response stays fresh.
+        maxsize (int): Maximum number of cached responses.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, maxsize: int = DEFAULT_MAXSIZE):
+        """
+        Initialize a new ResponseCache.
+
+        Args:
+            ttl (float): Seconds a cached response stays fresh.
+            maxsize (int): Maximum number of cached responses.
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Look up an entry, fresh or stale, and mark it as recently used.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            CacheEntry: The cached entry, or None if there is none.
+        """
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """
+        Store an entry, evicting the least recently used ones if the cache is full.
+
+        Args:
+            key (str): The cache key.
+            entry (CacheEntry): The entry to store.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Remove every entry from the cache.
+        """
+
+    def store(self, key: str, response: 'requests.Response',
+              previous: Optional[CacheEntry] = None) -> 'requests.Response':
+        """
+        Cache a fresh response, or renew the previous entry if the server answered `304 Not Modified`.
+
+        Args:
+            key (str): The cache key.
+            response (requests.Response): The response received from the server.
+            previous (CacheEntry, optional): The stale entry the request was revalidating.
+
+        Returns:
+            requests.Response: The response to hand to the caller.
+        """
+        expires_at = time.time() + self.ttl
+        if response.status_code == 304 and previous is not None:
+            entry = previous._replace(expires_at=expires_at)
+            self.set(key, entry)
+            return entry.to_response()
+        if response.status_code == 200:
+            self.set(key, CacheEntry(response.status_code, dict(response.headers), response.content,
+                                     response.headers.get('ETag'), expires_at))
+        return response
+
+
+class MemoryCache(ResponseCache):
+    """
+    A thread-safe in-memory response cache with LRU eviction.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, maxsize: int = DEFAULT_MAXSIZE):
+        super().__init__(ttl=ttl, maxsize=maxsize)
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache(ResponseCache):
+    """
+    An on-disk response cache stored in a sqlite database, with LRU eviction.
+
+    The cache survives restarts and can be shared by several processes on the same machine.
+    """
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL, maxsize: int = DEFAULT_MAXSIZE):
+        """
+        Initialize a new SQLiteCache, creating the database if needed.
+
+        Args:
+            path (str): The path of the sqlite database file.
+            ttl (float): Seconds a cached response stays fresh.
+            maxsize (int): Maximum number of cached responses.
+        """
+        super().__init__(ttl=ttl, maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, status_code INTEGER, headers TEXT, '
+            'content BLOB, etag TEXT, expires_at REAL, accessed_at REAL)'
+        )
+        self._connection.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT status_code, headers, content, etag, expires_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+        return CacheEntry(row[0], json.loads(row[1]), bytes(row[2]), row[3], row[4])
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, entry.status_code, json.dumps(entry.headers), entry.content, entry.etag, entry.expires_at,
+                 time.time())
+            )
+            self._connection.execute(
+                'DELETE FROM responses WHERE key IN '
+                '(SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)', (self.maxsize,)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM responses')
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection.
+        """
+        self._connection.close()
@@ -0,0 +1,195 @@
+"""
+This module decodes JSON response bodies with the fastest decoder available.
+
+orjson or msgspec are used when installed, falling back to the standard library otherwise;
+install them with `pip install echodata[fast]`. Bodies are decoded from the raw bytes, which
+skips building an intermediate text copy of large pages. For collections with a known schema,
+elements can also be decoded straight into compact records: msgspec structs when msgspec is
+installed, or `__slots__` classes otherwise. Both keep only the declared fields and use far less
+memory per element than dictionaries.
+"""
+import json
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None
+
+_msgspec_module: Any = None
+
+
+def _msgspec() -> Any:
+    """
+    Import the optional msgspec dependency on first use, as it is only needed for records.
+
+    Returns:
+        module: The msgspec module, or None if it is not installed.
+    """
+    global _msgspec_module
+    if _msgspec_module is None:
+        try:
+            import msgspec  # pylint: disable=import-outside-toplevel
+        except ImportError:  # pragma: no cover - depends on the installed extras
+            msgspec = False
+        _msgspec_module = msgspec
+    return _msgspec_module or None
+
+
+_loads: Any = None
+_decoder: Optional[str] = None
+
+
+def _get_loads() -> Any:
+    """
+    Pick the fastest available decoder on first use, so importing this module never imports msgspec.
+
+    Returns:
+        Callable: The function decoding a JSON document.
+    """
+    global _loads, _decoder
+    if _loads is None:
+        if orjson is not None:
+            _decoder, _loads = 'orjson', orjson.loads  # pylint: disable=no-member
+        elif _msgspec() is not None:
+            _decoder, _loads = 'msgspec', _msgspec().json.decode
+        else:
+            _decoder, _loads = 'json', json.loads
+    return _loads
+
+
+def __getattr__(name: str) -> Any:
+    # `DECODER` names the decoder in use, which is only picked on first use
+    if name == 'DECODER':
+        _get_loads()
+        return _decoder
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode a JSON document with the fastest available decoder.
+
+    Args:
+        data (Union[bytes, str]): The JSON document.
+
+    Returns:
+        Any: The decoded document.
+    """
+    return (_loads or _get_loads())(data)
+
+
+def decode_response(response: Any) -> Any:
+    """
+    Decode the JSON body of an HTTP response from its raw bytes.
+
+    Args:
+        response (Any): A `requests` or `httpx` response.
+
+    Returns:
+        Any: The decoded body.
+    """
+    return (_loads or _get_loads())(response.content)
+
+
+class Record:
+    """
+    Base class of the `__slots__` records created by `make_record_type`.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Record':
+        """
+        Build a record from a decoded element, dropping undeclared fields.
+
+        Args:
+            data (Dict[str, Any]): The decoded element.
+
+        Returns:
+            Record: The record.
+        """
+        record = cls.__new__(cls)
+        for field in cls.__slots__:
+            setattr(record, field, data.get(field))
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the record back to a dictionary.
+
+        Returns:
+            Dict[str, Any]: The record's fields.
+        """
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ', '.join(f'{field}={getattr(self, field)!r}' for field in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+
+def make_record_type(name: str, fields: Sequence[str]) -> type:
+    """
+    Create a compact record type for elements with the given top-level fields.
+
+    Args:
+        name (str): The name of the type.
+        fields (Sequence[str]): The element fields to keep. Nested values stay decoded as JSON.
+
+    Returns:
+        type: A msgspec struct type if msgspec is installed, a `Record` subclass otherwise.
+    """
+    msgspec = _msgspec()
+    if msgspec is not None:
+        return msgspec.defstruct(name, [(field, Any, None) for field in fields])
+    return type(name, (Record,), {'__slots__': tuple(fields)})
+
+
+def record_to_dict(record: Any) -> Dict[str, Any]:
+    """
+    Convert a record created by `make_record_type` back to a dictionary.
+
+    Args:
+        record (Any): The record.
+
+    Returns:
+        Dict[str, Any]: The record's fields.
+    """
+    if isinstance(record, Record):
+        return record.to_dict()
+    return _msgspec().structs.asdict(record)
+
+
+_page_decoders: Dict[type, Any] = {}
+
+
+def decode_page(data: bytes, record_type: Optional[type] = None) -> Dict[str, Any]:
+    """
+    Decode a page of a paginated collection, optionally into records.
+
+    Args:
+        data (bytes): The raw JSON body of the page.
+        record_type (type, optional): A type created by `make_record_type` for the page's elements.
+
+    Returns:
+        Dict[str, Any]: The page, whose `elements` are records if a record type is given.
+    """
+    if record_type is None:
+        return (_loads or _get_loads())(data)
+    msgspec = _msgspec()
+    if msgspec is not None and not issubclass(record_type, Record):
+        decoder = _page_decoders.get(record_type)
+        if decoder is None:
+            page_type = msgspec.defstruct('Page', [
+                ('elements', List[record_type], msgspec.field(default_factory=list)),
+                ('paging', Dict[str, Any], msgspec.field(default_factory=dict))
+            ])
+            decoder = _page_decoders[record_type] = msgspec.json.Decoder(page_type)
+        page = decoder.decode(data)
+        return {'elements': page.elements, 'paging': page.paging}
+    page = (_loads or _get_loads())(data)
+    page['elements'] = [record_type.from_dict(element) for element in page.get('elements', [])]
+    return page
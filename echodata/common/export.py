@@ -0,0 +1,371 @@
+"""
+This module exports streams of API result elements to NDJSON, CSV or Parquet in fixed-size chunks.
+
+Only one chunk of elements is held in memory at a time, so memory use does not grow with the
+size of the report. After every committed chunk a checkpoint next to the output records how many
+rows are safely on disk; an interrupted export resumes from there instead of starting over.
+NDJSON and CSV can be gzip-compressed, with every chunk written as its own gzip member. Parquet
+output is a directory of part files whose row groups are the chunks; part files are committed
+when they are complete. Parquet requires pyarrow; install it with `pip install echodata[arrow]`.
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence
+
+from .files import atomic_write
+from .frames import Column, ColumnarBuilder, infer_schema, page_columns
+
+DEFAULT_CHUNK_SIZE = 10000
+DEFAULT_CHUNKS_PER_FILE = 10
+FORMATS = ('ndjson', 'csv', 'parquet')
+
+
+def checkpoint_path(path: str) -> str:
+    """
+    Get the path of the checkpoint file of an export.
+
+    Args:
+        path (str): The path of the export.
+
+    Returns:
+        str: The path of its checkpoint file.
+    """
+    return f'{path.rstrip(os.sep)}.checkpoint.json'
+
+
+def read_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read the checkpoint of an unfinished export.
+
+    Args:
+        path (str): The path of the export.
+
+    Returns:
+        Dict[str, Any]: The checkpoint, or None if the export is not in progress.
+    """
+    try:
+        with open(checkpoint_path(path), 'r') as checkpoint_file:
+            return json.load(checkpoint_file)
+    except FileNotFoundError:
+        return None
+
+
+def _chunks(elements: Iterable[Dict[str, Any]], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Group a stream of elements into lists of at most `chunk_size` elements.
+
+    Args:
+        elements (Iterable[Dict[str, Any]]): The elements.
+        chunk_size (int): The maximum chunk size.
+
+    Yields:
+        List[Dict[str, Any]]: The chunks.
+    """
+    iterator = iter(elements)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ReportWriter(ABC):
+    """
+    Abstract base class for chunked, resumable report writers.
+
+    Attributes:
+        path (str): The path of the export.
+        schema (List[Column]): The columns of the export, if the format needs them.
+        state (Dict[str, Any]): Format-specific progress that is stored in the checkpoint.
+    """
+
+    def __init__(self, path: str, schema: Optional[Sequence[Column]] = None, state: Optional[Dict[str, Any]] = None):
+        """
+        Initialize a new ReportWriter, either fresh or resuming from a checkpoint state.
+
+        Args:
+            path (str): The path of the export.
+            schema (Sequence[Column], optional): The columns of the export.
+            state (Dict[str, Any], optional): The format-specific state of the checkpoint to resume from.
+        """
+        self.path = path
+        self.schema = list(schema) if schema is not None else None
+        self.state = state if state is not None else {}
+
+    @abstractmethod
+    def write_chunk(self, elements: List[Dict[str, Any]]) -> bool:
+        """
+        Write a chunk of elements.
+
+        Args:
+            elements (List[Dict[str, Any]]): The elements of the chunk.
+
+        Returns:
+            bool: True if the chunk is durably committed and the checkpoint may advance.
+        """
+
+    def close(self) -> None:
+        """
+        Finish the export, committing any pending data.
+        """
+
+
+class _TextWriter(ReportWriter):
+    """
+    Base class for line-based formats that are appended to a single, optionally gzip-compressed file.
+    """
+
+    def __init__(self, path: str, schema: Optional[Sequence[Column]] = None, state: Optional[Dict[str, Any]] = None,
+                 compression: Optional[str] = None):
+        super().__init__(path, schema, state)
+        if compression not in (None, 'gzip'):
+            raise ValueError(f"Unsupported compression '{compression}', expected None or 'gzip'.")
+        self.compression = compression
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Drop anything written after the last committed chunk
+        with open(path, 'ab') as output:
+            output.truncate(self.state.get('offset', 0))
+
+    @abstractmethod
+    def _encode(self, elements: List[Dict[str, Any]]) -> str:
+        """
+        Encode a chunk of elements as text.
+
+        Args:
+            elements (List[Dict[str, Any]]): The elements of the chunk.
+
+        Returns:
+            str: The encoded chunk.
+        """
+
+    def write_chunk(self, elements: List[Dict[str, Any]]) -> bool:
+        data = self._encode(elements).encode('utf-8')
+        if self.compression == 'gzip':
+            data = gzip.compress(data)
+        with open(self.path, 'ab') as output:
+            output.write(data)
+            output.flush()
+            os.fsync(output.fileno())
+            self.state['offset'] = output.tell()
+        return True
+
+
+class NDJSONWriter(_TextWriter):
+    """
+    Writes one JSON document per line.
+    """
+
+    def _encode(self, elements: List[Dict[str, Any]]) -> str:
+        return ''.join(json.dumps(element, separators=(',', ':')) + '\n' for element in elements)
+
+
+class CSVWriter(_TextWriter):
+    """
+    Writes flattened elements as CSV rows, with a header before the first chunk.
+    """
+
+    def _encode(self, elements: List[Dict[str, Any]]) -> str:
+        if self.schema is None:
+            self.schema = infer_schema(elements)
+        columns = page_columns(elements, self.schema)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not self.state.get('offset'):
+            writer.writerow([column.name for column in self.schema])
+        writer.writerows(zip(*(columns[column.name] for column in self.schema)))
+        return buffer.getvalue()
+
+
+class ParquetWriter(ReportWriter):
+    """
+    Writes a directory of Parquet part files, with one row group per chunk.
+    """
+
+    def __init__(self, path: str, schema: Optional[Sequence[Column]] = None, state: Optional[Dict[str, Any]] = None,
+                 compression: Optional[str] = 'snappy', chunks_per_file: int = DEFAULT_CHUNKS_PER_FILE):
+        super().__init__(path, schema, state)
+        self.compression = compression
+        self.chunks_per_file = chunks_per_file
+        self.state.setdefault('parts', 0)
+        self._writer = None
+        self._chunks_in_part = 0
+        os.makedirs(path, exist_ok=True)
+        # Drop part files that were never committed
+        for name in os.listdir(path):
+            if name.endswith('.tmp'):
+                os.remove(os.path.join(path, name))
+
+    def _part_path(self) -> str:
+        """
+        Get the final path of the part file being written.
+
+        Returns:
+            str: The part file path.
+        """
+        return os.path.join(self.path, f"part-{self.state['parts']:05d}.parquet")
+
+    def write_chunk(self, elements: List[Dict[str, Any]]) -> bool:
+        import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+        builder = ColumnarBuilder(self.schema, backend='arrow')
+        batch = builder.convert_page(elements)
+        self.schema = builder.schema
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(f'{self._part_path()}.tmp', batch.schema, compression=self.compression)
+        self._writer.write_batch(batch, row_group_size=len(elements))
+        self._chunks_in_part += 1
+        if self._chunks_in_part < self.chunks_per_file:
+            return False
+        self._commit_part()
+        return True
+
+    def _commit_part(self) -> None:
+        """
+        Finish the current part file and move it into place.
+        """
+        if self._writer is None:
+            return
+        self._writer.close()
+        os.replace(f'{self._part_path()}.tmp', self._part_path())
+        self._writer = None
+        self._chunks_in_part = 0
+        self.state['parts'] += 1
+
+    def close(self) -> None:
+        self._commit_part()
+
+
+def _create_writer(path: str, fmt: str, schema: Optional[Sequence[Column]], state: Optional[Dict[str, Any]],
+                   compression: Optional[str]) -> ReportWriter:
+    """
+    Create the writer of an export format.
+
+    Args:
+        path (str): The path of the export.
+        fmt (str): One of 'ndjson', 'csv' or 'parquet'.
+        schema (Sequence[Column], optional): The columns of the export.
+        state (Dict[str, Any], optional): The format-specific state to resume from.
+        compression (str, optional): The compression of the output.
+
+    Returns:
+        ReportWriter: The writer.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if fmt == 'ndjson':
+        return NDJSONWriter(path, schema, state, compression=compression)
+    if fmt == 'csv':
+        return CSVWriter(path, schema, state, compression=compression)
+    if fmt == 'parquet':
+        return ParquetWriter(path, schema, state, compression=compression or 'snappy')
+    raise ValueError(f"Unknown export format '{fmt}', expected one of {FORMATS}.")
+
+
+def _clear_output(path: str) -> None:
+    """
+    Remove the output and checkpoint of a previous export.
+
+    Args:
+        path (str): The path of the export.
+    """
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+    if os.path.exists(checkpoint_path(path)):
+        os.remove(checkpoint_path(path))
+
+
+def export_elements(elements: Iterable[Dict[str, Any]], path: str, fmt: str = 'ndjson',
+                    schema: Optional[Sequence[Column]] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    compression: Optional[str] = None, checkpoint: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Export a stream of elements in fixed-size chunks, checkpointing after every committed chunk.
+
+    To resume an interrupted export, pass the checkpoint returned by `read_checkpoint` and a
+    stream that starts at its `rows` offset. Without a checkpoint, any previous output is replaced.
+    The checkpoint is removed once the export completes.
+
+    Args:
+        elements (Iterable[Dict[str, Any]]): The elements to export.
+        path (str): The output file, or the output directory for Parquet.
+        fmt (str): One of 'ndjson', 'csv' or 'parquet'.
+        schema (Sequence[Column], optional): The columns of CSV and Parquet exports, inferred from the first chunk if not given.
+        chunk_size (int): Number of elements per chunk.
+        compression (str, optional): 'gzip' for NDJSON and CSV, or a Parquet codec such as 'snappy' or 'zstd'.
+        checkpoint (Dict[str, Any], optional): The checkpoint of the export to resume.
+
+    Returns:
+        int: The total number of exported rows, including those of a resumed run.
+    """
+    if checkpoint is None:
+        _clear_output(path)
+        checkpoint = {'format': fmt, 'compression': compression, 'rows': 0, 'state': {}}
+    elif checkpoint.get('schema') is not None:
+        schema = [Column(*column) for column in checkpoint['schema']]
+    writer = _create_writer(path, checkpoint['format'], schema, checkpoint['state'], checkpoint['compression'])
+    pending_rows = 0
+    for chunk in _chunks(elements, chunk_size):
+        pending_rows += len(chunk)
+        if writer.write_chunk(chunk):
+            checkpoint['rows'] += pending_rows
+            checkpoint['schema'] = writer.schema
+            atomic_write(checkpoint_path(path), json.dumps(checkpoint))
+            pending_rows = 0
+    writer.close()
+    if os.path.exists(checkpoint_path(path)):
+        os.remove(checkpoint_path(path))
+    return checkpoint['rows'] + pending_rows
+
+
+def merge_ndjson(path: str, records: Iterable[Dict[str, Any]], key: Callable[[Dict[str, Any]], Hashable]) -> int:
+    """
+    Merge records into an NDJSON export, replacing existing records with the same key.
+
+    The existing file is streamed line by line into a temporary file that replaces it
+    atomically, so only the merged records are held in memory.
+
+    Args:
+        path (str): The path of the NDJSON file. It is created if it does not exist.
+        records (Iterable[Dict[str, Any]]): The new or changed records.
+        key (Callable[[Dict[str, Any]], Hashable]): Function returning the identity of a record.
+
+    Returns:
+        int: The number of records in the merged file.
+    """
+    pending = {key(record): record for record in records}
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    count = 0
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as output:
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as existing:
+                    for line in existing:
+                        if not line.strip():
+                            continue
+                        record = json.loads(line)
+                        record = pending.pop(key(record), record)
+                        output.write(json.dumps(record, separators=(',', ':')) + '\n')
+                        count += 1
+            for record in pending.values():
+                output.write(json.dumps(record, separators=(',', ':')) + '\n')
+                count += 1
+            output.flush()
+            os.fsync(output.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
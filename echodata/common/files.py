@@ -0,0 +1,72 @@
+"""
+This module provides file helpers for state that several threads or processes write to.
+
+`atomic_write` replaces a file in a single rename so readers never see a half-written file,
+and `file_lock` serializes read-modify-write cycles across processes.
+"""
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # pragma: no cover - POSIX
+    msvcrt = None
+
+_thread_lock = threading.RLock()
+
+
+def atomic_write(filepath: str, data: Union[str, bytes]) -> None:
+    """
+    Write a file atomically by writing a temporary file next to it and renaming it into place.
+
+    Args:
+        filepath (str): The path of the file to write.
+        data (Union[str, bytes]): The new content of the file.
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(filepath)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(data.encode() if isinstance(data, str) else data)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def file_lock(filepath: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock on `<filepath>.lock` across threads and processes.
+
+    Args:
+        filepath (str): The path of the file to protect.
+    """
+    lock_path = f'{filepath}.lock'
+    os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+    with _thread_lock, open(lock_path, 'a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
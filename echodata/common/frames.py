@@ -0,0 +1,404 @@
+"""
+This module turns streams of API result pages into typed columnar data.
+
+Pages are converted one at a time into pandas DataFrame chunks or Arrow record batches that
+follow a declared schema, so the raw dictionaries of a page can be released as soon as it has
+been converted and no list of all elements, nor a `json_normalize` pass over it, is needed.
+Nested fields are addressed with dotted paths, list items by their index, and URN fields can be
+flattened to the id they reference. pandas and pyarrow are optional dependencies, imported on first
+use; install them with `pip install echodata[pandas]` and `pip install echodata[arrow]`.
+"""
+import json
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+    import pyarrow as pa
+
+PANDAS_DTYPES = {
+    'int': 'Int64',
+    'float': 'Float64',
+    'bool': 'boolean',
+    'str': 'string',
+    'urn': 'string',
+    'timestamp': 'datetime64[ms]',
+    'object': 'object'
+}
+
+
+class Column(NamedTuple):
+    """
+    A column of a columnar schema.
+
+    Attributes:
+        name (str): The column name.
+        path (str): Dotted path of the field inside an element, e.g. 'dateRange.start.year' or 'pivotValues.0'.
+        dtype (str): One of 'int', 'float', 'bool', 'str', 'urn', 'timestamp' (epoch milliseconds) or 'object'.
+    """
+    name: str
+    path: str
+    dtype: str = 'object'
+
+
+def urn_id(urn: Optional[str]) -> Optional[str]:
+    """
+    Extract the id a URN refers to, e.g. '123' from 'urn:li:sponsoredCampaign:123'.
+
+    Args:
+        urn (str, optional): The URN.
+
+    Returns:
+        str: The last segment of the URN, or None if no URN is given.
+    """
+    return urn.rsplit(':', 1)[-1] if urn is not None else None
+
+
+def flatten(element: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """
+    Flatten a nested element into a dictionary keyed by dotted paths.
+
+    Args:
+        element (Dict[str, Any]): The element to flatten.
+        prefix (str): Path prefix of the element's keys.
+
+    Returns:
+        Dict[str, Any]: The scalar and list values of the element keyed by their path.
+    """
+    flat = {}
+    for key, value in element.items():
+        path = f'{prefix}{key}'
+        if isinstance(value, dict):
+            flat.update(flatten(value, f'{path}.'))
+        else:
+            flat[path] = value
+    return flat
+
+
+def _infer_dtype(path: str, value: Any) -> str:
+    """
+    Guess the column type of a flattened field from one of its values.
+
+    Args:
+        path (str): The dotted path of the field.
+        value (Any): A value of the field.
+
+    Returns:
+        str: The inferred column type.
+    """
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'timestamp' if path.endswith(('.time', 'At')) else 'int'
+    if isinstance(value, float):
+        return 'float'
+    if isinstance(value, str):
+        return 'urn' if value.startswith('urn:') else 'str'
+    return 'object'
+
+
+def infer_schema(elements: Iterable[Dict[str, Any]]) -> List[Column]:
+    """
+    Infer a schema from sample elements, typically the first page of a result.
+
+    A field holding both integers and floats in the sample becomes a float column.
+
+    Args:
+        elements (Iterable[Dict[str, Any]]): The sample elements.
+
+    Returns:
+        List[Column]: One column per flattened field, named after its path.
+    """
+    dtypes: Dict[str, str] = {}
+    for element in elements:
+        for path, value in flatten(element).items():
+            if value is None:
+                dtypes.setdefault(path, 'object')
+                continue
+            dtype = dtypes.get(path, 'object')
+            if dtype == 'object':
+                dtypes[path] = _infer_dtype(path, value)
+            elif dtype in ('int', 'timestamp') and isinstance(value, float):
+                dtypes[path] = 'float'
+    return [Column(path, path, dtype) for path, dtype in dtypes.items()]
+
+
+def compile_path(path: str) -> Tuple[Union[str, int], ...]:
+    """
+    Split a dotted path into dictionary keys and list indexes.
+
+    Args:
+        path (str): The dotted path.
+
+    Returns:
+        Tuple[Union[str, int], ...]: The path segments.
+    """
+    return tuple(int(part) if part.isdigit() else part for part in path.split('.'))
+
+
+def extract(element: Any, segments: Tuple[Union[str, int], ...]) -> Any:
+    """
+    Get the value at a compiled path, or None if any segment is missing.
+
+    Args:
+        element (Any): The element.
+        segments (Tuple[Union[str, int], ...]): The compiled path.
+
+    Returns:
+        Any: The value at the path.
+    """
+    for segment in segments:
+        try:
+            element = element[segment]
+        except (KeyError, IndexError):
+            return None
+        except TypeError:
+            # Records decoded with `make_record_type` expose their fields as attributes
+            element = getattr(element, segment, None) if isinstance(segment, str) else None
+            if element is None:
+                return None
+    return element
+
+
+def _convert(value: Any, dtype: str) -> Any:
+    """
+    Convert a raw value to the Python type of its column.
+
+    Args:
+        value (Any): The raw value.
+        dtype (str): The column type.
+
+    Returns:
+        Any: The converted value, or None for missing values.
+
+    Raises:
+        ValueError: If the value does not fit the column type, e.g. a fractional number in an int column.
+    """
+    if value is None or dtype == 'object':
+        return value
+    if dtype in ('int', 'timestamp'):
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"{value!r} is not an integer")
+        return int(value)
+    if dtype == 'float':
+        return float(value)
+    if dtype == 'bool':
+        return bool(value)
+    if dtype == 'urn':
+        return urn_id(str(value))
+    return str(value)
+
+
+def page_columns(elements: Sequence[Dict[str, Any]], schema: Sequence[Column]) -> Dict[str, List[Any]]:
+    """
+    Extract the columns of one page of elements.
+
+    Args:
+        elements (Sequence[Dict[str, Any]]): The elements of the page.
+        schema (Sequence[Column]): The columns to extract.
+
+    Returns:
+        Dict[str, List[Any]]: The converted values of every column.
+
+    Raises:
+        ValueError: If a value does not fit its column type, e.g. when a schema inferred from an earlier
+            page is too narrow.
+    """
+    columns = {}
+    for column in schema:
+        segments = compile_path(column.path)
+        try:
+            columns[column.name] = [_convert(extract(element, segments), column.dtype) for element in elements]
+        except ValueError as e:
+            raise ValueError(f"Column '{column.name}' cannot hold a value as {column.dtype}: {e}. "
+                             f"Declare a schema with a wider type.") from e
+    return columns
+
+
+def arrow_schema(schema: Sequence[Column]) -> 'pa.Schema':
+    """
+    Build the Arrow schema matching a columnar schema.
+
+    Args:
+        schema (Sequence[Column]): The columns.
+
+    Returns:
+        pyarrow.Schema: The Arrow schema.
+    """
+    pa = _require_pyarrow()
+    types = {
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'bool': pa.bool_(),
+        'str': pa.string(),
+        'urn': pa.string(),
+        'timestamp': pa.timestamp('ms'),
+        'object': pa.string()
+    }
+    return pa.schema([(column.name, types[column.dtype]) for column in schema])
+
+
+def _require_pandas():
+    """
+    Import the optional pandas dependency.
+
+    Returns:
+        module: The pandas module.
+
+    Raises:
+        ImportError: If pandas is not installed.
+    """
+    try:
+        import pandas  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise ImportError("DataFrame output requires pandas. Install it with `pip install echodata[pandas]`.") from e
+    return pandas
+
+
+def _require_pyarrow():
+    """
+    Import the optional pyarrow dependency.
+
+    Returns:
+        module: The pyarrow module.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise ImportError("Arrow output requires pyarrow. Install it with `pip install echodata[arrow]`.") from e
+    return pyarrow
+
+
+class ColumnarBuilder:
+    """
+    Incrementally builds a pandas DataFrame or an Arrow table from pages of elements.
+
+    Attributes:
+        schema (List[Column]): The columns of the output, inferred from the first non-empty page if not given.
+        backend (str): Either 'pandas' or 'arrow'.
+        rows (int): Number of rows added so far.
+    """
+
+    def __init__(self, schema: Optional[Sequence[Column]] = None, backend: str = 'pandas'):
+        """
+        Initialize a new ColumnarBuilder.
+
+        Args:
+            schema (Sequence[Column], optional): The columns of the output.
+            backend (str): Either 'pandas' or 'arrow'.
+
+        Raises:
+            ValueError: If the backend is unknown.
+        """
+        if backend not in ('pandas', 'arrow'):
+            raise ValueError(f"Unknown backend '{backend}', expected 'pandas' or 'arrow'.")
+        self.schema = list(schema) if schema is not None else None
+        self.backend = backend
+        self.rows = 0
+        self._chunks: List[Any] = []
+
+    def convert_page(self, elements: Sequence[Dict[str, Any]]) -> Any:
+        """
+        Convert one page of elements into a columnar chunk without keeping it.
+
+        Args:
+            elements (Sequence[Dict[str, Any]]): The elements of the page.
+
+        Returns:
+            Any: A pandas DataFrame or an Arrow record batch.
+        """
+        if not self.schema:
+            self.schema = infer_schema(elements)
+        columns = page_columns(elements, self.schema)
+        if self.backend == 'arrow':
+            pa = _require_pyarrow()
+            schema = arrow_schema(self.schema)
+            arrays = [pa.array(self._arrow_values(columns[column.name], column.dtype), type=field.type)
+                      for column, field in zip(self.schema, schema)]
+            return pa.RecordBatch.from_arrays(arrays, schema=schema)
+        pd = _require_pandas()
+        return pd.DataFrame({column.name: pd.Series(columns[column.name], dtype=PANDAS_DTYPES[column.dtype])
+                             for column in self.schema})
+
+    @staticmethod
+    def _arrow_values(values: List[Any], dtype: str) -> List[Any]:
+        """
+        Prepare column values for Arrow, which stores untyped values as strings: lists and records are
+        encoded as JSON, other values with `str`.
+
+        Args:
+            values (List[Any]): The converted column values.
+            dtype (str): The column type.
+
+        Returns:
+            List[Any]: The values ready for `pyarrow.array`.
+        """
+        if dtype == 'object':
+            return [None if value is None else json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+                    for value in values]
+        return values
+
+    def add_page(self, elements: Sequence[Dict[str, Any]]) -> None:
+        """
+        Convert one page of elements and add it to the output.
+
+        Args:
+            elements (Sequence[Dict[str, Any]]): The elements of the page.
+        """
+        if not elements:
+            return  # An empty page may not have a schema to convert it with yet
+        chunk = self.convert_page(elements)
+        self.rows += len(elements)
+        self._chunks.append(chunk)
+
+    def build(self) -> Any:
+        """
+        Assemble the chunks added so far.
+
+        Returns:
+            Any: A pandas DataFrame or an Arrow table.
+        """
+        if self.backend == 'arrow':
+            pa = _require_pyarrow()
+            return pa.Table.from_batches(self._chunks, schema=arrow_schema(self.schema or []))
+        pd = _require_pandas()
+        if not self._chunks:
+            return pd.DataFrame({column.name: pd.Series([], dtype=PANDAS_DTYPES[column.dtype])
+                                 for column in self.schema or []})
+        return pd.concat(self._chunks, ignore_index=True)
+
+
+def pages_to_dataframe(pages: Iterable[Dict[str, Any]], schema: Optional[Sequence[Column]] = None) -> 'pd.DataFrame':
+    """
+    Build a pandas DataFrame from a stream of API result pages.
+
+    Args:
+        pages (Iterable[Dict[str, Any]]): Pages with an `elements` field, e.g. from `iter_linkedin_pages`.
+        schema (Sequence[Column], optional): The columns of the output, inferred from the first non-empty page if not given.
+
+    Returns:
+        pandas.DataFrame: The typed, flattened elements of every page.
+    """
+    builder = ColumnarBuilder(schema, backend='pandas')
+    for page in pages:
+        builder.add_page(page.get('elements', []))
+    return builder.build()
+
+
+def pages_to_arrow(pages: Iterable[Dict[str, Any]], schema: Optional[Sequence[Column]] = None) -> 'pa.Table':
+    """
+    Build an Arrow table from a stream of API result pages.
+
+    Args:
+        pages (Iterable[Dict[str, Any]]): Pages with an `elements` field, e.g. from `iter_linkedin_pages`.
+        schema (Sequence[Column], optional): The columns of the output, inferred from the first non-empty page if not given.
+
+    Returns:
+        pyarrow.Table: The typed, flattened elements of every page.
+    """
+    builder = ColumnarBuilder(schema, backend='arrow')
+    for page in pages:
+        builder.add_page(page.get('elements', []))
+    return builder.build()
@@ -0,0 +1,300 @@
+"""
+This module provides the instrumentation hooks and metrics of echodata.
+
+The request, retry, pagination and rate-limiting code emit events such as `request`, `retry`,
+`page` and `throttle` with structured fields. Callbacks can subscribe to them with `add_hook`,
+and the `MetricsCollector` aggregates them into per-endpoint latency histograms, retry counts,
+bytes transferred and throughput that can be exported as a snapshot.
+
+Emitting an event without subscribers costs a single dictionary lookup.
+"""
+import bisect
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+EVENTS = ('request', 'retry', 'page', 'throttle')
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_hooks: Dict[str, List[Callable[..., None]]] = {}
+_hooks_lock = threading.Lock()
+
+
+def add_hook(event: str, callback: Callable[..., None]) -> None:
+    """
+    Subscribe a callback to an event. It is called with the event's fields as keyword arguments.
+
+    Args:
+        event (str): One of 'request', 'retry', 'page' or 'throttle'.
+        callback (Callable[..., None]): The callback.
+
+    Raises:
+        ValueError: If the event is unknown.
+    """
+    if event not in EVENTS:
+        raise ValueError(f"Unknown event '{event}', expected one of {EVENTS}.")
+    with _hooks_lock:
+        _hooks[event] = _hooks.get(event, []) + [callback]
+
+
+def remove_hook(event: str, callback: Callable[..., None]) -> None:
+    """
+    Unsubscribe a callback from an event.
+
+    Callbacks are compared by equality, so a bound method can be removed with a new reference to it.
+
+    Args:
+        event (str): The event.
+        callback (Callable[..., None]): The callback.
+    """
+    with _hooks_lock:
+        _hooks[event] = [hook for hook in _hooks.get(event, []) if hook != callback]
+
+
+def emit(event: str, **fields: Any) -> None:
+    """
+    Call the callbacks subscribed to an event. Failing callbacks are logged and never propagate.
+
+    Args:
+        event (str): The event.
+        **fields: The event's fields.
+    """
+    for hook in _hooks.get(event, ()):
+        try:
+            hook(**fields)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Instrumentation hook %r failed for event '%s'.", hook, event)
+
+
+def exception_endpoint(exception: BaseException, default: str) -> str:
+    """
+    Get the URL path of the request that raised an exception.
+
+    Args:
+        exception (BaseException): The exception, typically raised by requests or httpx.
+        default (str): The value to return if the exception carries no request.
+
+    Returns:
+        str: The URL path of the failed request, or the default.
+    """
+    try:
+        request = getattr(exception, 'request', None)
+    except RuntimeError:  # httpx raises when the exception has no request
+        request = None
+    url = getattr(request, 'url', None)
+    return urlsplit(str(url)).path if url else default
+
+
+class Histogram:
+    """
+    A thread-safe histogram with fixed bucket bounds.
+
+    Attributes:
+        bounds (Sequence[float]): Upper bounds of the buckets; larger values fall into an overflow bucket.
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """
+        Record a value.
+
+        Args:
+            value (float): The value.
+        """
+        with self._lock:
+            self._counts[bisect.bisect_left(self.bounds, value)] += 1
+            self._sum += value
+            self._count += 1
+            self._max = max(self._max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile as the upper bound of the bucket it falls into.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimate, or None if no value was recorded.
+        """
+        with self._lock:
+            if not self._count:
+                return None
+            rank = q * self._count
+            seen = 0
+            for bound, count in zip(self.bounds + (self._max,), self._counts):
+                seen += count
+                if seen >= rank:
+                    return min(bound, self._max)
+            return self._max
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Export the histogram.
+
+        Returns:
+            Dict[str, Any]: The count, sum, mean, max, p50, p99 and bucket counts.
+        """
+        p50, p99 = self.quantile(0.5), self.quantile(0.99)
+        with self._lock:
+            buckets = {f'le_{bound}': count for bound, count in zip(self.bounds, self._counts)}
+            buckets['overflow'] = self._counts[-1]
+            return {
+                'count': self._count,
+                'sum': self._sum,
+                'mean': self._sum / self._count if self._count else None,
+                'max': self._max,
+                'p50': p50,
+                'p99': p99,
+                'buckets': buckets
+            }
+
+
+class MetricsCollector:
+    """
+    Aggregates instrumentation events into per-endpoint metrics.
+
+    Attributes:
+        started_at (float): Unix timestamp when collection started.
+    """
+
+    def __init__(self, latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """
+        Initialize a new MetricsCollector. Call `install` to start collecting.
+
+        Args:
+            latency_buckets (Sequence[float]): Upper bounds of the latency histogram buckets in seconds.
+        """
+        self.started_at = time.time()
+        self._latency_buckets = latency_buckets
+        self._latencies: Dict[str, Histogram] = {}
+        self._counters: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._lock = threading.Lock()
+
+    def _histogram(self, endpoint: str) -> Histogram:
+        histogram = self._latencies.get(endpoint)
+        if histogram is None:
+            with self._lock:
+                histogram = self._latencies.setdefault(endpoint, Histogram(self._latency_buckets))
+        return histogram
+
+    def _count(self, endpoint: str, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[endpoint][name] += value
+
+    def on_request(self, endpoint: str, elapsed: float, status: Optional[int] = None, bytes_received: int = 0,
+                   error: Optional[str] = None, **_: Any) -> None:
+        """
+        Record a finished HTTP request.
+        """
+        self._histogram(endpoint).observe(elapsed)
+        self._count(endpoint, 'requests')
+        self._count(endpoint, 'bytes', bytes_received)
+        if error is not None or (status is not None and status >= 400):
+            self._count(endpoint, 'errors')
+
+    def on_retry(self, endpoint: str, **_: Any) -> None:
+        """
+        Record a retried call.
+        """
+        self._count(endpoint, 'retries')
+
+    def on_page(self, endpoint: str, elements: int, **_: Any) -> None:
+        """
+        Record a fetched page of a paginated collection.
+        """
+        self._count(endpoint, 'pages')
+        self._count(endpoint, 'elements', elements)
+
+    def on_throttle(self, endpoint: str, delay: float, **_: Any) -> None:
+        """
+        Record a throttled response.
+        """
+        self._count(endpoint, 'throttled')
+        self._count(endpoint, 'throttle_seconds', delay)
+
+    def install(self) -> 'MetricsCollector':
+        """
+        Subscribe the collector to every instrumentation event.
+
+        Returns:
+            MetricsCollector: The collector itself.
+        """
+        for event in EVENTS:
+            add_hook(event, getattr(self, f'on_{event}'))
+        return self
+
+    def uninstall(self) -> None:
+        """
+        Unsubscribe the collector from every instrumentation event.
+        """
+        for event in EVENTS:
+            remove_hook(event, getattr(self, f'on_{event}'))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Export the collected metrics.
+
+        Returns:
+            Dict[str, Any]: The elapsed time and, per endpoint, the counters, rates and latency histogram.
+        """
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        with self._lock:
+            endpoints = {endpoint: dict(counters) for endpoint, counters in self._counters.items()}
+            latencies = dict(self._latencies)
+        for endpoint, counters in endpoints.items():
+            if 'pages' in counters:
+                counters['pages_per_second'] = counters['pages'] / elapsed
+            if 'requests' in counters:
+                counters['requests_per_second'] = counters['requests'] / elapsed
+        for endpoint, histogram in latencies.items():
+            endpoints.setdefault(endpoint, {})['latency'] = histogram.snapshot()
+        return {'elapsed': elapsed, 'endpoints': endpoints}
+
+
+_collector: Optional[MetricsCollector] = None
+
+
+def enable_metrics() -> MetricsCollector:
+    """
+    Start collecting metrics with a shared collector, replacing any previous one.
+
+    Returns:
+        MetricsCollector: The shared collector.
+    """
+    global _collector
+    disable_metrics()
+    _collector = MetricsCollector().install()
+    return _collector
+
+
+def disable_metrics() -> None:
+    """
+    Stop collecting metrics with the shared collector.
+    """
+    global _collector
+    if _collector is not None:
+        _collector.uninstall()
+        _collector = None
+
+
+def get_metrics() -> Optional[MetricsCollector]:
+    """
+    Get the shared collector.
+
+    Returns:
+        MetricsCollector: The shared collector, or None if metrics are disabled.
+    """
+    return _collector
@@ -2,28 +2,76 @@
 This module defines the abstract base class for handling authentication tokens.
 
 It includes the definition of the Token class which encapsulates the properties and methods related to an authentication token, such as the token's value and its expiration details. The class provides functionality to convert token information to JSON, save it to a file, and check the token's validity.
+The TokenExpiryIndex orders many tokens by expiration to find the ones that expire soon.
 """
 import configparser
-import errno
+import heapq
+import io
+import itertools
 import json
+import logging
 import os
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from ..files import atomic_write, file_lock
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CLOCK_SKEW = 30.0
+
+_clock_skew = DEFAULT_CLOCK_SKEW
+
+
+def set_clock_skew(seconds: float) -> None:
+    """
+    Set the margin by which tokens are considered expired before their expiration timestamp.
+
+    The margin absorbs clock differences with the issuer and the time a request spends in flight,
+    so a token is never sent moments before it expires.
+
+    Args:
+        seconds (float): The clock-skew margin in seconds.
+
+    Raises:
+        ValueError: If the margin is negative.
+    """
+    global _clock_skew
+    if seconds < 0:
+        raise ValueError("The clock-skew margin cannot be negative.")
+    _clock_skew = float(seconds)
+
+
+def get_clock_skew() -> float:
+    """
+    Get the margin by which tokens are considered expired before their expiration timestamp.
+
+    Returns:
+        float: The clock-skew margin in seconds.
+    """
+    return _clock_skew
 
 
 class Token(ABC):
     """
     Abstract base class for a generic authentication token.
 
+    Tokens use `__slots__` and keep their expiration as a float Unix timestamp, so many of them can be
+    held in memory and checked for expiry without allocating datetime objects.
+
     Attributes:
         value (str): The value of the token.
         expiration_timestamp (float): The Unix timestamp when the token expires.
 
     Methods:
-        value: Property to get or set the token's value.
+        value: The token's value.
         expiration_timestamp: Property to get or set the token's expiration timestamp.
         expires_at: Property to get the token's expiration as a datetime object.
-        is_expired: Method to check if the token is expired.
+        is_expired: Property to check if the token is expired.
+        expires_within: Method to check if the token expires within a number of seconds.
         show_expire_date: Method to get the token's expiration date as a string.
         to_json: Method to serialize the token to a JSON-compliant dictionary.
         save_to_json: Method to save the token information as JSON to a file.
@@ -31,6 +79,7 @@ class Token(ABC):
         save_to_config_ini: Method to save the token information to a .ini file.
         is_valid: Abstract method to check the token's validity.
     """
+    __slots__ = ('value', '_expiration_timestamp')
 
     def __init__(self, value:str, expiration_timestamp:str):
         """
@@ -40,28 +89,8 @@ class Token(ABC):
             value (str): The token value as a string.
             expiration_timestamp (str): The expiration time as a Unix timestamp string.
         """
-        self.__value= value
-        self.__expiration_timestamp = float(expiration_timestamp)
-
-    @property
-    def value(self) -> str:
-        """
-        Get the token's value.
-
-        Returns:
-            str: The current value of the token.
-        """
-        return self.__value
-
-    @value.setter
-    def value(self,value:str):
-        """
-        Set the token's value.
-
-        Args:
-            value (str): The new value to assign to the token.
-        """
-        self.__value = value
+        self.value = value
+        self._expiration_timestamp = float(expiration_timestamp)
 
     @property
     def expiration_timestamp(self) -> float:
@@ -71,7 +100,7 @@ class Token(ABC):
         Returns:
             float: The current expiration timestamp of the token.
         """
-        return self.__expiration_timestamp
+        return self._expiration_timestamp
 
     @expiration_timestamp.setter
     def expiration_timestamp(self,expiration_timestamp:str):
@@ -79,9 +108,9 @@ class Token(ABC):
         Set the token's expiration timestamp.
 
         Args:
-            expiration_timestamp (str): The new expiration timestamp to assign to the token.
+            expiration_timestamp (str): The new expiration timestamp to assign to the token, or None once it is revoked.
         """
-        self.__expiration_timestamp = float(expiration_timestamp)
+        self._expiration_timestamp = None if expiration_timestamp is None else float(expiration_timestamp)
 
     @property
     def expires_at(self) -> datetime:
@@ -91,17 +120,33 @@ class Token(ABC):
         Returns:
             datetime: The expiration time of the token.
         """
-        return datetime.fromtimestamp(self.__expiration_timestamp)
+        return datetime.fromtimestamp(self._expiration_timestamp)
 
     @property
     def is_expired(self) -> bool:
         """
-        Check if the token is expired.
+        Check if the token is expired, or expires within the clock-skew margin.
 
         Returns:
             bool: True if the current time is past the token's expiration, False otherwise.
         """
-        return self.expires_at>datetime.now()
+        expiration = self._expiration_timestamp
+        return expiration is None or time.time() + _clock_skew >= expiration
+
+    def expires_within(self, seconds: float, now: Optional[float] = None) -> bool:
+        """
+        Check if the token expires within a number of seconds, clock-skew margin included.
+
+        Args:
+            seconds (float): The number of seconds from now.
+            now (float, optional): The current Unix timestamp, to check many tokens against the same time.
+
+        Returns:
+            bool: True if the token expires before then, False otherwise.
+        """
+        expiration = self._expiration_timestamp
+        now = time.time() if now is None else now
+        return expiration is None or now + seconds + _clock_skew >= expiration
 
     def show_expire_date(self) -> str:
         """
@@ -122,13 +167,15 @@ class Token(ABC):
         return {
             'value': self.value,
             'expiration_timestamp': self.expiration_timestamp,
-            'expires_at': self.expires_at
+            'expires_at': self.expires_at.isoformat()
         }
 
     def save_to_json(self, filepath:str):
         """
         Save the token information as a JSON file at the specified filepath.
 
+        The file is replaced atomically, so readers never see a partially written token.
+
         Args:
             filepath (str): The path where the JSON file will be saved.
 
@@ -140,22 +187,13 @@ class Token(ABC):
         # Convert the Token object into a dictionary for JSON serialization
         token_data = self.to_json()
 
-        # Check if the directory exists, if not create it
-        if not os.path.exists(os.path.dirname(filepath)):
-            try:
-                os.makedirs(os.path.dirname(filepath))
-            except OSError as exc:  # Guard against race condition
-                if exc.errno != errno.EEXIST:
-                    raise
-
-        # Attempt to write the dictionary to a JSON file
+        # Attempt to write the dictionary to a JSON file, creating its directory if needed
         try:
-            with open(filepath, 'w') as json_file:
-                json.dump(token_data, json_file, indent=4)
+            atomic_write(filepath, json.dumps(token_data, indent=4))
         except IOError as e:
-            print(f"An error occurred while writing the file: {e}")
+            logger.error("An error occurred while writing the file: %s", e)
         except Exception as e:
-            print(f"An unexpected error occurred: {e}")
+            logger.exception("An unexpected error occurred: %s", e)
 
     def to_config_ini(self):
         """
@@ -170,6 +208,9 @@ class Token(ABC):
         """
         Save the token information to a .ini configuration file at the specified filepath.
 
+        The file is merged under an inter-process lock and replaced atomically. For many tokens, prefer
+        a `SQLiteTokenStore`, which saves each token without rewriting the others.
+
         Args:
             filepath (str): The path where the .ini file will be saved.
 
@@ -177,20 +218,22 @@ class Token(ABC):
             IOError: If an error occurs while writing the file.
         """
         config = self.to_config_ini()
-        # Make sure to preserve existing data if the file already exists
-        if os.path.exists(filepath):
-            existing_config = configparser.ConfigParser()
-            existing_config.read(filepath)
-            # Merge the existing config with the new token data
-            for section in config.sections():
-                if section not in existing_config:
-                    existing_config.add_section(section)
-                for key, value in config[section].items():
-                    existing_config[section][key] = value
-            config = existing_config
-        # Write the updated configuration to file
-        with open(filepath, 'w') as configfile:
-            config.write(configfile)
+        with file_lock(filepath):
+            # Make sure to preserve existing data if the file already exists
+            if os.path.exists(filepath):
+                existing_config = configparser.ConfigParser()
+                existing_config.read(filepath)
+                # Merge the existing config with the new token data
+                for section in config.sections():
+                    if section not in existing_config:
+                        existing_config.add_section(section)
+                    for key, value in config[section].items():
+                        existing_config[section][key] = value
+                config = existing_config
+            # Write the updated configuration to file
+            buffer = io.StringIO()
+            config.write(buffer)
+            atomic_write(filepath, buffer.getvalue())
 
     def __repr__(self):
         """
@@ -212,3 +255,120 @@ class Token(ABC):
         """
         # This is an abstract method that must be implemented by child classes
         pass
+
+
+class TokenExpiryIndex:
+    """
+    Index of many tokens ordered by expiration, answering which of them expire soon.
+
+    The index is a binary heap of `(expiration_timestamp, key, version)` entries. Updating or removing
+    a key leaves its old entry in the heap, where it is recognized by its outdated version, skipped
+    and compacted away later, so every change
+    costs O(log n). Finding the tokens that expire within a window only visits the heap entries that
+    fall inside it, and the next expiration is available in O(1).
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty TokenExpiryIndex.
+        """
+        self._heap: List[Tuple[float, str, int]] = []
+        self._expirations: Dict[str, float] = {}
+        self._versions: Dict[str, int] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._expirations)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._expirations
+
+    def set(self, key: str, expiration_timestamp: float) -> None:
+        """
+        Add a key or move it to a new expiration.
+
+        Args:
+            key (str): The member or account the token belongs to.
+            expiration_timestamp (float): The Unix timestamp when the token expires.
+        """
+        expiration_timestamp = float(expiration_timestamp)
+        if self._expirations.get(key) == expiration_timestamp:
+            return
+        version = self._versions[key] = next(self._counter)
+        self._expirations[key] = expiration_timestamp
+        heapq.heappush(self._heap, (expiration_timestamp, key, version))
+        self._compact()
+
+    def add(self, key: str, token: Token) -> None:
+        """
+        Add a token, or move it after it was refreshed.
+
+        Args:
+            key (str): The member or account the token belongs to.
+            token (Token): The token.
+        """
+        self.set(key, token.expiration_timestamp)
+
+    def remove(self, key: str) -> None:
+        """
+        Remove a key from the index.
+
+        Args:
+            key (str): The member or account the token belongs to.
+        """
+        if self._expirations.pop(key, None) is not None:
+            del self._versions[key]
+            self._compact()
+
+    def _is_current(self, entry: Tuple[float, str, int]) -> bool:
+        """
+        Check whether a heap entry is the latest one of its key.
+        """
+        return self._versions.get(entry[1]) == entry[2]
+
+    def _compact(self) -> None:
+        """
+        Drop stale entries from the top of the heap, and rebuild it when most entries are stale.
+        """
+        heap = self._heap
+        while heap and not self._is_current(heap[0]):
+            heapq.heappop(heap)
+        if len(heap) > 2 * len(self._expirations) + 16:
+            self._heap = [(expiration, key, self._versions[key]) for key, expiration in self._expirations.items()]
+            heapq.heapify(self._heap)
+
+    def next_expiration(self) -> Optional[Tuple[str, float]]:
+        """
+        Get the token that expires first.
+
+        Returns:
+            Tuple[str, float]: The key and expiration timestamp of that token, or None if the index is empty.
+        """
+        if not self._heap:
+            return None
+        expiration, key, _ = self._heap[0]
+        return key, expiration
+
+    def expiring_within(self, seconds: float, now: Optional[float] = None) -> List[str]:
+        """
+        List the tokens that expire within a number of seconds, clock-skew margin included.
+
+        Args:
+            seconds (float): The number of seconds from now.
+            now (float, optional): The current Unix timestamp.
+
+        Returns:
+            List[str]: The keys of those tokens, soonest expiration first.
+        """
+        deadline = (time.time() if now is None else now) + seconds + _clock_skew
+        heap = self._heap
+        found, pending = [], [0] if heap else []
+        while pending:
+            position = pending.pop()
+            entry = heap[position]
+            if entry[0] > deadline:
+                continue  # Every descendant of this entry expires even later
+            if self._is_current(entry):
+                found.append(entry)
+            pending.extend(child for child in (2 * position + 1, 2 * position + 2) if child < len(heap))
+        return [key for _, key, _ in sorted(found)]
@@ -0,0 +1,463 @@
+"""
+This module implements the rate limiting and retry accounting shared by every echodata request.
+
+It provides a thread-safe token bucket that can be awaited from asyncio code as well, a rate
+limiter combining an application-wide bucket with one bucket per member, a retry budget that
+stops retry storms once too many calls are failing, and jittered backoff that honours the
+`Retry-After` header of throttled responses.
+"""
+import hashlib
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from .metrics import emit, exception_endpoint
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+DEFAULT_MAX_MEMBERS = 10000
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket.
+
+    Callers reserve tokens and are told how long to wait until the reservation is covered, which
+    lets blocking code sleep and asyncio code await for the same bucket.
+
+    Attributes:
+        rate (float): Number of tokens added per second.
+        capacity (float): Maximum number of tokens the bucket holds, i.e. the allowed burst.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize a new, full TokenBucket.
+
+        Args:
+            rate (float): Number of tokens added per second.
+            capacity (float, optional): Maximum number of tokens. Defaults to one second worth of tokens.
+
+        Raises:
+            ValueError: If the rate is not positive.
+        """
+        if rate <= 0:
+            raise ValueError("The rate must be positive.")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """
+        Add the tokens earned since the last update. Must be called with the lock held.
+
+        Args:
+            now (float): The current monotonic time.
+        """
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, going into debt if necessary.
+
+        Args:
+            tokens (float): Number of tokens to take.
+
+        Returns:
+            float: Seconds the caller has to wait before using the reserved tokens.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def try_take(self, tokens: float = 1.0) -> bool:
+        """
+        Take tokens from the bucket only if they are available right now.
+
+        Args:
+            tokens (float): Number of tokens to take.
+
+        Returns:
+            bool: True if the tokens were taken, False otherwise.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def deposit(self, tokens: float) -> None:
+        """
+        Put tokens back into the bucket, up to its capacity.
+
+        Args:
+            tokens (float): Number of tokens to add.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + tokens)
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Block until the requested tokens are available.
+
+        Args:
+            tokens (float): Number of tokens to take.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def async_acquire(self, tokens: float = 1.0) -> None:
+        """
+        Wait without blocking the event loop until the requested tokens are available.
+
+        Args:
+            tokens (float): Number of tokens to take.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    A token bucket whose state lives in shared memory, so worker processes draw from one budget.
+
+    The bucket must be handed to the workers when they are started, e.g. through the
+    `initargs` of a process pool.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, context=None):
+        """
+        Initialize a new, full SharedTokenBucket.
+
+        Args:
+            rate (float): Number of tokens added per second.
+            capacity (float, optional): Maximum number of tokens. Defaults to one second worth of tokens.
+            context (multiprocessing.context.BaseContext, optional): The multiprocessing context of the workers.
+        """
+        import multiprocessing  # pylint: disable=import-outside-toplevel
+
+        context = context or multiprocessing.get_context()
+        # The state exists before the base class fills the bucket through the properties below
+        self._state = context.RawArray('d', 2)
+        super().__init__(rate, capacity)
+        self._lock = context.Lock()
+
+    @property
+    def _tokens(self) -> float:
+        return self._state[0]
+
+    @_tokens.setter
+    def _tokens(self, value: float) -> None:
+        self._state[0] = value
+
+    @property
+    def _updated(self) -> float:
+        return self._state[1]
+
+    @_updated.setter
+    def _updated(self, value: float) -> None:
+        self._state[1] = value
+
+
+class RateLimiter:
+    """
+    Rate limiter with one bucket for the whole application and one bucket per member.
+
+    LinkedIn throttles both per application and per member, so every request takes a token from
+    the application bucket and from the bucket of the member it is sent on behalf of. A throttled
+    response pauses all callers until its `Retry-After` has passed. Member buckets are keyed by a
+    hash of the member key, so access tokens are not kept in memory, and only the most recently
+    used `max_members` buckets are kept.
+
+    Attributes:
+        application_rate (float): Requests per second allowed for the application, or None for no limit.
+        member_rate (float): Requests per second allowed per member, or None for no limit.
+    """
+
+    def __init__(self, application_rate: Optional[float] = None, application_burst: Optional[float] = None,
+                 member_rate: Optional[float] = None, member_burst: Optional[float] = None,
+                 application_bucket: Optional[TokenBucket] = None, max_members: int = DEFAULT_MAX_MEMBERS):
+        """
+        Initialize a new RateLimiter.
+
+        Args:
+            application_rate (float, optional): Requests per second allowed for the application.
+            application_burst (float, optional): Burst size of the application bucket.
+            member_rate (float, optional): Requests per second allowed per member.
+            member_burst (float, optional): Burst size of each member bucket.
+            application_bucket (TokenBucket, optional): An existing application bucket, e.g. a `SharedTokenBucket`, used instead of the rate and burst.
+            max_members (int): Maximum number of member buckets to keep; the least recently used are dropped.
+        """
+        self.application_rate = application_bucket.rate if application_bucket is not None else application_rate
+        self.member_rate = member_rate
+        self._member_burst = member_burst
+        if application_bucket is None and application_rate:
+            application_bucket = TokenBucket(application_rate, application_burst)
+        self._application = application_bucket
+        self._max_members = max_members
+        self._members: 'OrderedDict[bytes, TokenBucket]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+
+    def _member_bucket(self, member: Optional[str]) -> Optional[TokenBucket]:
+        """
+        Get the bucket of a member, creating it on first use.
+
+        Args:
+            member (str, optional): The member key, e.g. the access token the request is sent with.
+
+        Returns:
+            TokenBucket: The member's bucket, or None if members are not limited.
+        """
+        if member is None or not self.member_rate:
+            return None
+        key = hashlib.blake2b(member.encode(), digest_size=16).digest()
+        with self._lock:
+            bucket = self._members.get(key)
+            if bucket is None:
+                bucket = self._members[key] = TokenBucket(self.member_rate, self._member_burst)
+                if len(self._members) > self._max_members:
+                    self._members.popitem(last=False)
+            else:
+                self._members.move_to_end(key)
+        return bucket
+
+    def _reserve(self, member: Optional[str]) -> float:
+        """
+        Reserve one request for the application and the member.
+
+        Args:
+            member (str, optional): The member key.
+
+        Returns:
+            float: Seconds the caller has to wait before sending the request.
+        """
+        wait = max(0.0, self._paused_until - time.monotonic())
+        for bucket in (self._application, self._member_bucket(member)):
+            if bucket is not None:
+                wait = max(wait, bucket.reserve())
+        return wait
+
+    def acquire(self, member: Optional[str] = None) -> None:
+        """
+        Block until a request may be sent.
+
+        Args:
+            member (str, optional): The member key.
+        """
+        wait = self._reserve(member)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def async_acquire(self, member: Optional[str] = None) -> None:
+        """
+        Wait without blocking the event loop until a request may be sent.
+
+        Args:
+            member (str, optional): The member key.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        wait = self._reserve(member)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back every caller for the given time, e.g. after a throttled response.
+
+        Args:
+            seconds (float): Number of seconds to pause for.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class RetryBudget:
+    """
+    A budget limiting retries to a fraction of the successful calls.
+
+    Every successful call deposits `ratio` retries into the budget and the budget also refills by
+    `min_per_second`, so occasional failures are always retried while a failing upstream does not
+    get flooded with retries from every thread and task.
+
+    Attributes:
+        ratio (float): Retries earned per successful call.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, capacity: float = 10.0):
+        """
+        Initialize a new, full RetryBudget.
+
+        Args:
+            ratio (float): Retries earned per successful call.
+            min_per_second (float): Retries earned per second regardless of traffic.
+            capacity (float): Maximum number of retries that can be saved up.
+        """
+        self.ratio = ratio
+        self._bucket = TokenBucket(min_per_second, capacity)
+
+    def record_success(self) -> None:
+        """
+        Earn retries for a successful call.
+        """
+        self._bucket.deposit(self.ratio)
+
+    def try_spend(self) -> bool:
+        """
+        Spend one retry if the budget allows it.
+
+        Returns:
+            bool: True if the retry may go ahead, False if the budget is exhausted.
+        """
+        return self._bucket.try_take()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse the value of a `Retry-After` header.
+
+    Args:
+        value (str, optional): The header value, either a number of seconds or an HTTP date.
+
+    Returns:
+        float: Seconds to wait, or None if the value is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime  # pylint: disable=import-outside-toplevel
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0, retry_after: Optional[float] = None) -> float:
+    """
+    Compute the delay before a retry using exponential backoff with full jitter.
+
+    Args:
+        attempt (int): Number of the failed attempt, starting at 0.
+        base (float): Delay of the first retry in seconds.
+        cap (float): Upper bound of the backoff in seconds.
+        retry_after (float, optional): Delay requested by the server, which is always honoured.
+
+    Returns:
+        float: Seconds to wait before retrying.
+    """
+    jittered = random.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after is not None:
+        return retry_after + jittered * 0.1
+    return jittered
+
+
+def retry_delay(exception: BaseException, attempt: int, max_retries: int, base: float, cap: float,
+                statuses=RETRYABLE_STATUSES, budget: Optional[RetryBudget] = None) -> Optional[float]:
+    """
+    Decide whether a failed call should be retried and how long to wait first.
+
+    HTTP errors are only retried for the given statuses. A throttled response also pauses the
+    shared rate limiter for its `Retry-After`.
+
+    Args:
+        exception (BaseException): The exception raised by the failed call.
+        attempt (int): Number of the failed attempt, starting at 0.
+        max_retries (int): Maximum number of attempts.
+        base (float): Delay of the first retry in seconds.
+        cap (float): Upper bound of the backoff in seconds.
+        statuses (Collection[int]): HTTP statuses worth retrying.
+        budget (RetryBudget, optional): The retry budget to spend from. Defaults to the shared budget.
+
+    Returns:
+        float: Seconds to wait before retrying, or None if the exception should be raised.
+    """
+    response = getattr(exception, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if status is not None and status not in statuses:
+        return None
+    if attempt + 1 >= max_retries or not (budget or get_retry_budget()).try_spend():
+        return None
+    retry_after = parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+    delay = backoff_delay(attempt, base=base, cap=cap, retry_after=retry_after)
+    if status == 429:
+        get_rate_limiter().pause(delay)
+        emit('throttle', endpoint=exception_endpoint(exception, ''), delay=delay)
+    return delay
+
+
+_rate_limiter = RateLimiter()
+_retry_budget = RetryBudget()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get the rate limiter shared by all echodata requests.
+
+    Returns:
+        RateLimiter: The shared rate limiter.
+    """
+    return _rate_limiter
+
+
+def configure_rate_limits(application_rate: Optional[float] = None, application_burst: Optional[float] = None,
+                          member_rate: Optional[float] = None, member_burst: Optional[float] = None,
+                          application_bucket: Optional[TokenBucket] = None) -> RateLimiter:
+    """
+    Replace the shared rate limiter. By default requests are not rate limited.
+
+    Args:
+        application_rate (float, optional): Requests per second allowed for the application.
+        application_burst (float, optional): Burst size of the application bucket.
+        member_rate (float, optional): Requests per second allowed per member.
+        member_burst (float, optional): Burst size of each member bucket.
+        application_bucket (TokenBucket, optional): An existing application bucket, e.g. a `SharedTokenBucket`.
+
+    Returns:
+        RateLimiter: The new shared rate limiter.
+    """
+    global _rate_limiter
+    _rate_limiter = RateLimiter(application_rate, application_burst, member_rate, member_burst, application_bucket)
+    return _rate_limiter
+
+
+def get_retry_budget() -> RetryBudget:
+    """
+    Get the retry budget shared by all echodata requests.
+
+    Returns:
+        RetryBudget: The shared retry budget.
+    """
+    return _retry_budget
+
+
+def configure_retry_budget(ratio: float = 0.2, min_per_second: float = 1.0, capacity: float = 10.0) -> RetryBudget:
+    """
+    Replace the shared retry budget.
+
+    Args:
+        ratio (float): Retries earned per successful call.
+        min_per_second (float): Retries earned per second regardless of traffic.
+        capacity (float): Maximum number of retries that can be saved up.
+
+    Returns:
+        RetryBudget: The new shared retry budget.
+    """
+    global _retry_budget
+    _retry_budget = RetryBudget(ratio, min_per_second, capacity)
+    return _retry_budget
@@ -0,0 +1,101 @@
+"""
+This module manages the HTTP session shared by every request that echodata sends.
+
+Reusing one `requests.Session` keeps connections to the same host alive between calls, so a
+loop of thousands of requests pays for the TCP and TLS handshakes only once per pooled
+connection instead of once per call.
+"""
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 32
+
+_session: Optional['requests.Session'] = None
+_session_lock = threading.Lock()
+
+
+def create_session(pool_connections: int = DEFAULT_POOL_CONNECTIONS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                   pool_block: bool = False, headers: Optional[Dict[str, str]] = None) -> 'requests.Session':
+    """
+    Create a new HTTP session with a keep-alive connection pool.
+
+    Args:
+        pool_connections (int): Number of hosts to keep connection pools for.
+        pool_maxsize (int): Maximum number of connections kept open per host.
+        pool_block (bool): Whether to wait for a free connection instead of opening a throwaway one when the pool is exhausted.
+        headers (Dict[str, str], optional): Default headers sent with every request of the session.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    # requests is only imported once a session is needed, which keeps `import echodata` fast
+    import requests  # pylint: disable=import-outside-toplevel,redefined-outer-name
+    from requests.adapters import HTTPAdapter  # pylint: disable=import-outside-toplevel
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def get_session() -> 'requests.Session':
+    """
+    Get the shared HTTP session, creating it with the default pool settings on first use.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def set_session(session: Optional['requests.Session']) -> None:
+    """
+    Replace the shared HTTP session, closing the previous one.
+
+    Args:
+        session (requests.Session, optional): The new shared session, or None to fall back to a default session on next use.
+    """
+    global _session
+    with _session_lock:
+        previous, _session = _session, session
+    if previous is not None and previous is not session:
+        previous.close()
+
+
+def configure_session(pool_connections: int = DEFAULT_POOL_CONNECTIONS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                      pool_block: bool = False, headers: Optional[Dict[str, str]] = None) -> 'requests.Session':
+    """
+    Create a new shared HTTP session with the given pool settings.
+
+    Args:
+        pool_connections (int): Number of hosts to keep connection pools for.
+        pool_maxsize (int): Maximum number of connections kept open per host.
+        pool_block (bool): Whether to wait for a free connection instead of opening a throwaway one when the pool is exhausted.
+        headers (Dict[str, str], optional): Default headers sent with every request of the session.
+
+    Returns:
+        requests.Session: The new shared session.
+    """
+    session = create_session(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block,
+                             headers=headers)
+    set_session(session)
+    return session
+
+
+def close_session() -> None:
+    """
+    Close the shared HTTP session and release its pooled connections.
+    """
+    set_session(None)
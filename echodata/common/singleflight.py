@@ -0,0 +1,110 @@
+"""
+This module implements single-flight call deduplication.
+
+When several threads ask for the same key at the same moment, only the first one runs the call;
+the others wait for it and share its result or exception.
+"""
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share a key.
+    """
+
+    def __init__(self):
+        """
+        Initialize a new SingleFlight with no calls in flight.
+        """
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        """
+        Run `func` unless a call with the same key is already in flight, and return its result.
+
+        Args:
+            key (Hashable): The identity of the call.
+            func (Callable[[], T]): The call to run if none is in flight.
+
+        Returns:
+            T: The result of the call that ran for the key.
+
+        Raises:
+            Exception: Whatever the shared call raised.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def submit(self, key: Hashable, start: Callable[[], Future]) -> Future:
+        """
+        Start an asynchronous call unless a call with the same key is already in flight.
+
+        Calls started with `submit` and `do` share the same keys, so either kind waits for the other.
+
+        Args:
+            key (Hashable): The identity of the call.
+            start (Callable[[], Future]): Starts the call if none is in flight and returns its future.
+
+        Returns:
+            Future: Completed with the result or exception of the call that runs for the key.
+
+        Raises:
+            Exception: Whatever `start` raised.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future
+            future = self._calls[key] = Future()
+
+        def forget(_: Future) -> None:
+            with self._lock:
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+
+        future.add_done_callback(forget)
+        try:
+            call = start()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+
+        def complete(done: Future) -> None:
+            if done.exception() is not None:
+                future.set_exception(done.exception())
+            else:
+                future.set_result(done.result())
+
+        call.add_done_callback(complete)
+        return future
+
+    def in_flight(self) -> int:
+        """
+        Count the calls currently in flight.
+
+        Returns:
+            int: The number of distinct keys being fetched.
+        """
+        return len(self._calls)
@@ -0,0 +1,89 @@
+"""
+This module persists the progress of incremental syncs.
+
+The `SyncStateStore` keeps one small JSON document per endpoint and account in a sqlite
+database, e.g. the last analytics date already loaded or the latest modification time seen, so
+that the next run only has to fetch what changed since.
+"""
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class SyncStateStore:
+    """
+    A sqlite-backed store of sync state, keyed by endpoint and account.
+
+    Attributes:
+        path (str): The path of the sqlite database file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize a new SyncStateStore, creating the database if needed.
+
+        Args:
+            path (str): The path of the sqlite database file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS sync_state (endpoint TEXT, account TEXT, state TEXT, updated_at REAL, '
+            'PRIMARY KEY (endpoint, account))'
+        )
+
+    def get(self, endpoint: str, account: str) -> Dict[str, Any]:
+        """
+        Load the state of an endpoint and account.
+
+        Args:
+            endpoint (str): The synced endpoint.
+            account (str): The synced account.
+
+        Returns:
+            Dict[str, Any]: The stored state, or an empty dictionary before the first sync.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT state FROM sync_state WHERE endpoint = ? AND account = ?', (endpoint, account)
+            ).fetchone()
+        return json.loads(row[0]) if row is not None else {}
+
+    def set(self, endpoint: str, account: str, state: Dict[str, Any]) -> None:
+        """
+        Store the state of an endpoint and account.
+
+        Args:
+            endpoint (str): The synced endpoint.
+            account (str): The synced account.
+            state (Dict[str, Any]): The JSON-serializable state.
+        """
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)',
+                (endpoint, account, json.dumps(state), time.time())
+            )
+
+    def delete(self, endpoint: str, account: Optional[str] = None) -> None:
+        """
+        Forget the state of an endpoint, for one account or all of them, forcing a full sync.
+
+        Args:
+            endpoint (str): The synced endpoint.
+            account (str, optional): The synced account, or None for every account.
+        """
+        with self._lock:
+            if account is None:
+                self._connection.execute('DELETE FROM sync_state WHERE endpoint = ?', (endpoint,))
+            else:
+                self._connection.execute('DELETE FROM sync_state WHERE endpoint = ? AND account = ?', (endpoint, account))
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection.
+        """
+        self._connection.close()
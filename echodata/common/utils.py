@@ -1,15 +1,73 @@
+import functools
+import logging
+import threading
 import time
-from typing import Any, Callable, Dict, Optional, TypeVar
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Collection, Dict, Iterator, Optional, Tuple, TypeVar, Union
+from urllib.parse import urlsplit
 
-import requests
+from .metrics import emit, exception_endpoint
+from .ratelimit import RETRYABLE_STATUSES, RetryBudget, get_retry_budget, retry_delay
+from .session import get_session
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def set_host_concurrency(host: str, limit: Optional[int]) -> None:
+    """
+    Cap the number of requests that may be in flight to a host at the same time.
+
+    The cap is shared by every thread calling `make_request`, so it also holds when
+    several paginated or batched fetches run side by side.
+
+    Args:
+        host (str): The host name, e.g. 'api.linkedin.com'.
+        limit (int, optional): Maximum number of concurrent requests, or None to remove the cap.
+
+    Raises:
+        ValueError: If the limit is smaller than 1.
+    """
+    if limit is not None and limit < 1:
+        raise ValueError("The concurrency limit must be at least 1.")
+    with _host_semaphores_lock:
+        if limit is None:
+            _host_semaphores.pop(host, None)
+        else:
+            _host_semaphores[host] = threading.BoundedSemaphore(limit)
+
+
+@contextmanager
+def _host_slot(url: str) -> Iterator[None]:
+    """
+    Hold one of the concurrency slots of the URL's host for the duration of a request.
+
+    Args:
+        url (str): The URL that is about to be requested.
+    """
+    semaphore = _host_semaphores.get(urlsplit(url).hostname or '')
+    if semaphore is None:
+        yield
+        return
+    with semaphore:
+        yield
 
 
 def make_request(url: str, method: str = 'GET', headers: Optional[Dict[str, str]] = None,
                  data: Optional[Any] = None, params: Optional[Dict[str, str]] = None,
-                 timeout: int = 30) -> requests.Response:
+                 timeout: int = 30, session: Optional['requests.Session'] = None,
+                 raise_for_status: bool = True) -> 'requests.Response':
     """
     Make an HTTP request to a specified URL and return the raw response.
 
+    Requests go through the shared, connection-pooling session from `get_session` unless
+    another session is given.
+
     Args:
         url (str): The URL to which the request is to be made.
         method (str): The HTTP method, e.g., 'GET', 'POST', etc.
@@ -17,6 +75,9 @@ def make_request(url: str, method: str = 'GET', headers: Optional[Dict[str, str]
         data (Any, optional): Data to send with the request. Could be dict, bytes, or file-like object.
         params (Dict[str, str], optional): URL parameters to append to the URL.
         timeout (int): Timeout for the request in seconds.
+        session (requests.Session, optional): The session to send the request with.
+        raise_for_status (bool): Whether an unsuccessful status raises, or the response is returned for
+            the caller to inspect.
 
     Returns:
         requests.Response: The response object.
@@ -24,43 +85,84 @@ def make_request(url: str, method: str = 'GET', headers: Optional[Dict[str, str]
     Raises:
         requests.RequestException: For any issues with the request.
     """
+    import requests  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+    started = time.perf_counter()
+    response = error = None
     try:
-        response = requests.request(method, url, headers=headers, data=data, params=params, timeout=timeout)
-        response.raise_for_status()
+        with _host_slot(url):
+            response = (session or get_session()).request(method, url, headers=headers, data=data, params=params, timeout=timeout)
+        if raise_for_status:
+            response.raise_for_status()
         return response
     except requests.RequestException as e:
         # Handle any errors that occur during the request
-        print(f"An error occurred: {e}")
+        error = str(e)
+        logger.warning("%s %s failed: %s", method, url, e)
         raise
+    finally:
+        emit('request', method=method, endpoint=urlsplit(url).path, host=urlsplit(url).hostname,
+             status=response.status_code if response is not None else None, elapsed=time.perf_counter() - started,
+             bytes_received=len(response.content) if response is not None else 0, error=error)
+
+
+def request_exceptions() -> Tuple[type, ...]:
+    """
+    Get the transient `requests` errors worth retrying: timeouts, connection errors and HTTP errors.
+
+    Returns:
+        Tuple[type, ...]: The exception classes.
+    """
+    import requests  # pylint: disable=import-outside-toplevel,redefined-outer-name
+    return requests.Timeout, requests.ConnectionError, requests.HTTPError
 
 
 T = TypeVar('T')  # Generic type for decorator
 
 
-def retry(max_retries: int = 3, delay: int = 1, exceptions: tuple = (Exception,)) -> Callable[[Callable[..., T]], Callable[..., T]]:
+def retry(max_retries: int = 3, delay: float = 1,
+          exceptions: Union[tuple, Callable[[], tuple]] = (Exception,), max_delay: float = 60,
+          statuses: Collection[int] = RETRYABLE_STATUSES,
+          budget: Optional[RetryBudget] = None) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """
     A decorator that retries a function call upon specified exceptions.
 
+    Retries wait for a jittered exponential backoff, or for the `Retry-After` of a throttled
+    response. HTTP errors are only retried for the given statuses, and every retry is paid for
+    from a retry budget shared by all threads and tasks.
+
     Args:
-        max_retries (int): Maximum number of retries.
-        delay (int): Delay between retries in seconds.
-        exceptions (tuple): Exceptions to catch and retry on.
+        max_retries (int): Maximum number of attempts.
+        delay (float): Base delay between retries in seconds.
+        exceptions (Union[tuple, Callable[[], tuple]]): Exceptions to catch and retry on, or a function
+            returning them, so that exceptions of lazily imported modules can be named.
+        max_delay (float): Upper bound of the backoff in seconds.
+        statuses (Collection[int]): HTTP statuses worth retrying when an exception carries a response.
+        budget (RetryBudget, optional): The retry budget to spend from. Defaults to the shared budget.
 
     Returns:
         Callable: Decorated function that will retry upon specified exceptions.
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(func)
         def wrapper(*args, **kwargs) -> T:
-            mdelay = delay
-            for attempt in range(max_retries):
+            caught = exceptions if isinstance(exceptions, tuple) else exceptions()
+            attempt = 0
+            while True:
                 try:
-                    return func(*args, **kwargs)
-                except exceptions as e:
-                    print(f"Retry {attempt + 1}/{max_retries} for function {func.__name__} failed with error: {e}.")
-                    if attempt + 1 < max_retries:
-                        print(f"Retrying in {mdelay} seconds...")
-                        time.sleep(mdelay)
-                        mdelay *= 2  # Exponential backoff
-            raise  # Re-raise the last exception if all retries failed
+                    result = func(*args, **kwargs)
+                except caught as e:
+                    logger.warning("Attempt %d/%d of %s failed: %s", attempt + 1, max_retries, func.__name__, e)
+                    wait = retry_delay(e, attempt, max_retries, delay, max_delay, statuses, budget)
+                    if wait is None:
+                        raise  # Re-raise the last exception if it cannot be retried
+                    logger.info("Retrying %s in %.2f seconds.", func.__name__, wait)
+                    emit('retry', function=func.__name__, endpoint=exception_endpoint(e, func.__name__),
+                         attempt=attempt + 1, delay=wait, error=str(e))
+                    time.sleep(wait)
+                    attempt += 1
+                else:
+                    (budget or get_retry_budget()).record_success()
+                    return result
         return wrapper
     return decorator
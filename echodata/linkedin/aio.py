@@ -0,0 +1,227 @@
+"""
+This module provides asyncio versions of the LinkedIn API helpers.
+
+The functions mirror `linkedin_get_request`, the pagination helpers and the `LinkedInToken`
+network methods, with the same options and defaults, so a single event loop can drive many ad
+accounts concurrently instead of running the blocking API in threads.
+"""
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from ..common.aio import async_make_request, async_retry, httpx
+from ..common.cache import ResponseCache, cache_key
+from ..common.decode import decode_page
+from ..common.metrics import emit
+from ..common.ratelimit import get_rate_limiter
+from .projection import linkedin_projection
+from .restli import encode_query
+from .token import LinkedInToken
+from .utils import LINKEDIN_API_URL, LINKEDIN_HEADERS
+
+_RETRYABLE_ERRORS = (httpx.TransportError, httpx.HTTPStatusError) if httpx is not None else ()
+
+
+@async_retry(max_retries=3, delay=2, exceptions=_RETRYABLE_ERRORS)
+async def async_linkedin_get_request(endpoint: str, access_token: str, params: Optional[Dict[str, Any]] = None,
+                                     cache: Optional[ResponseCache] = None,
+                                     fields: Optional[Sequence[str]] = None) -> 'httpx.Response':
+    """
+    Send an asynchronous GET request to the LinkedIn API.
+
+    Dictionary parameters are encoded with the Rest.li 2.0 syntax, see `restli.encode_query`.
+    Every attempt first waits for the shared rate limiter, with the access token as member key.
+    With a cache, fresh cached responses are returned without a request, and stale ones are
+    revalidated with their ETag. Entries are shared with `linkedin_get_request`.
+
+    Args:
+        endpoint (str): The API endpoint to be appended to the base URL.
+        access_token (str): The OAuth access token for LinkedIn API authentication.
+        params (Dict[str, Any], optional): URL parameters to append to the request, or an encoded query string.
+        cache (ResponseCache, optional): The cache to serve and store the response with.
+        fields (Sequence[str], optional): Dotted paths of the fields to return, e.g. ['id', 'dailyBudget.amount'].
+
+    Returns:
+        httpx.Response: The response from the LinkedIn API.
+
+    Raises:
+        ValueError: If a field is unknown for the endpoint.
+        httpx.TransportError: For network-related issues, handled with retries.
+        httpx.HTTPStatusError: For unsuccessful HTTP responses; throttling and server errors are retried.
+    """
+    url = f'{LINKEDIN_API_URL}{endpoint}'
+    headers = dict(LINKEDIN_HEADERS, Authorization=f'Bearer {access_token}')
+
+    if fields:
+        projection = {'fields': linkedin_projection(endpoint, fields)}
+        if isinstance(params, str):
+            params = f'{params}&{encode_query(projection)}' if params else encode_query(projection)
+        else:
+            params = dict(params or {}, **projection)
+
+    key = entry = None
+    if cache is not None:
+        key = cache_key(url, params, access_token)
+        entry = cache.get(key)
+        if entry is not None and entry.is_fresh:
+            return entry.to_async_response(url)
+        if entry is not None and entry.etag:
+            headers['If-None-Match'] = entry.etag
+
+    # The query is appended as is, since httpx would re-encode the Rest.li syntax
+    query = encode_query(params) if isinstance(params, dict) else params
+    if query:
+        url = f'{url}?{query}'
+
+    await get_rate_limiter().async_acquire(member=access_token)
+    # httpx raises for `304 Not Modified`, so revalidations check the status themselves
+    revalidating = 'If-None-Match' in headers
+    response = await async_make_request(url=url, method='GET', headers=headers, raise_for_status=not revalidating)
+    if cache is None:
+        return response
+    if response.status_code == 304 and entry is not None:
+        cache.store(key, response, previous=entry)
+        return entry.to_async_response(url)
+    response.raise_for_status()
+    cache.store(key, response)
+    return response
+
+
+async def _async_get_page(endpoint: str, access_token: str, params: Dict[str, Any], start: int, count: int,
+                          record_type: Optional[type] = None,
+                          fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Fetch a single page of a paginated LinkedIn API collection.
+
+    Args:
+        endpoint (str): The API endpoint to be appended to the base URL.
+        access_token (str): The OAuth access token for LinkedIn API authentication.
+        params (Dict[str, Any]): URL parameters shared by every page.
+        start (int): The offset of the first element of the page.
+        count (int): The number of elements to request.
+        record_type (type, optional): A type created by `make_record_type` to decode the elements into.
+        fields (Sequence[str], optional): Dotted paths of the element fields to return.
+
+    Returns:
+        Dict[str, Any]: The decoded page, including its `elements` and `paging` fields.
+    """
+    page_params = dict(params, start=start, count=count)
+    response = await async_linkedin_get_request(endpoint, access_token, params=page_params, fields=fields)
+    page = decode_page(response.content, record_type)
+    emit('page', endpoint=endpoint, start=start, elements=len(page.get("elements", [])))
+    return page
+
+
+async def async_iter_linkedin_pages(endpoint: str, access_token: str, params: dict, max_count: int = 1000,
+                                    start: int = 0, max_workers: int = 1, record_type: Optional[type] = None,
+                                    fields: Optional[Sequence[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Lazily fetch the pages of a paginated LinkedIn API collection.
+
+    Pages are yielded in offset order. With `max_workers` greater than one, up to
+    `max_workers` pages are fetched ahead of the consumer.
+
+    Args:
+        endpoint (str): The API endpoint to be appended to the base URL.
+        access_token (str): The OAuth access token for LinkedIn API authentication.
+        params (dict): Initial URL parameters for the request.
+        max_count (int): Maximum number of items to retrieve per request.
+        start (int): The offset to start from, e.g. to resume an interrupted download.
+        max_workers (int): Number of pages to fetch concurrently.
+        record_type (type, optional): A type created by `make_record_type` to decode the elements into.
+        fields (Sequence[str], optional): Dotted paths of the element fields to return, e.g. ['id', 'name'].
+
+    Yields:
+        Dict[str, Any]: The decoded pages, including their `elements` and `paging` fields.
+    """
+    data = await _async_get_page(endpoint, access_token, params, start, max_count, record_type, fields)
+    total = data.get("paging", {}).get("total", 0)
+    yield data
+
+    pending: List[asyncio.Task] = []
+    try:
+        for offset in range(start + max_count, total, max_count):
+            pending.append(asyncio.ensure_future(_async_get_page(endpoint, access_token, params, offset, max_count,
+                                                                 record_type, fields)))
+            if len(pending) >= max(max_workers, 1):
+                yield await pending.pop(0)
+        while pending:
+            yield await pending.pop(0)
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def async_linkedin_paginated_request(endpoint: str, access_token: str, params: dict, max_count: int = 1000,
+                                           max_workers: int = 1, record_type: Optional[type] = None,
+                                           fields: Optional[Sequence[str]] = None) -> List[Any]:
+    """
+    Make paginated asynchronous GET requests to the LinkedIn API.
+
+    Args:
+        endpoint (str): The API endpoint to be appended to the base URL.
+        access_token (str): The OAuth access token for LinkedIn API authentication.
+        params (dict): Initial URL parameters for the request.
+        max_count (int): Maximum number of items to retrieve per request.
+        max_workers (int): Number of pages to fetch concurrently.
+        record_type (type, optional): A type created by `make_record_type` to decode the elements into.
+        fields (Sequence[str], optional): Dotted paths of the element fields to return, e.g. ['id', 'name'].
+
+    Returns:
+        List[Any]: A list of all items retrieved from the paginated API responses.
+    """
+    elements = []
+    async for page in async_iter_linkedin_pages(endpoint, access_token, params, max_count=max_count,
+                                                max_workers=max_workers, record_type=record_type, fields=fields):
+        elements.extend(page.get("elements", []))
+    return elements
+
+
+async def async_is_valid(token: LinkedInToken) -> bool:
+    """
+    Check asynchronously whether LinkedIn accepts the token.
+
+    The result is memoized on the token like `LinkedInToken.is_valid`.
+
+    Args:
+        token (LinkedInToken): The token to check.
+
+    Returns:
+        bool: True if an authenticated request with the token succeeds, False otherwise.
+    """
+    valid = token.cached_validity
+    if valid is not None:
+        return valid
+    headers = dict(LINKEDIN_HEADERS, Authorization=f'Bearer {token.value}')
+    response = await async_make_request(LinkedInToken.VALIDATION_URL, method='GET', headers=headers,
+                                        raise_for_status=False)
+    token.remember_validity(response.status_code == 200)
+    return response.status_code == 200
+
+
+async def async_refresh_access_token(token: LinkedInToken, client_id: str, client_secret: str) -> None:
+    """
+    Refresh the access token asynchronously, updating it in place.
+
+    Args:
+        token (LinkedInToken): The token to refresh.
+        client_id (str): The LinkedIn application's client id.
+        client_secret (str): The LinkedIn application's client secret.
+
+    Raises:
+        Exception: If LinkedIn rejects the refresh request.
+    """
+    headers = {
+        'Content-Type': 'application/x-www-form-urlencoded'
+    }
+    data = {
+        'grant_type': 'refresh_token',
+        'refresh_token': token.refresh_value,
+        'client_id': client_id,
+        'client_secret': client_secret
+    }
+    response = await async_make_request(LinkedInToken.REFRESH_URL, method='POST', headers=headers, data=data,
+                                        raise_for_status=False)
+    if response.status_code == 200:
+        token.update_from_refresh_response(response.json())
+    else:
+        raise Exception(f'Failed to refresh access token. Status code: {response.status_code}')
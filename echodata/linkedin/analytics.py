@@ -0,0 +1,206 @@
+"""
+This module fetches LinkedIn ad analytics, splitting large queries into shards.
+
+A single `adAnalytics` request is limited in how many rows it can return and how many campaigns
+or accounts it can facet on. `fetch_ad_analytics` therefore splits a query by date window and by
+batches of campaign or account URNs, fetches the shards concurrently and merges them into one
+list of analytics elements.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+from itertools import product
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..common.decode import decode_response
+from .projection import linkedin_projection
+from .restli import restli_date_range, restli_list
+from .utils import linkedin_get_request
+
+ANALYTICS_ENDPOINT = '/adAnalytics'
+DEFAULT_WINDOW_DAYS = 31
+DEFAULT_BATCH_SIZE = 20
+DEFAULT_MAX_WORKERS = 8
+
+# Fields identifying an analytics element, always requested so elements of different shards can be merged
+KEY_FIELDS = ('pivotValues', 'dateRange')
+# The pivot that matches each facet; shards of such reports never share a pivot value
+FACET_PIVOTS = {'campaigns': 'CAMPAIGN', 'accounts': 'ACCOUNT'}
+# Metrics that cannot be added up across shards
+NON_ADDITIVE_METRICS = frozenset({'approximateMemberReach', 'averageDwellTime'})
+
+
+def date_windows(start: date, end: date, days: int) -> List[Tuple[date, date]]:
+    """
+    Split an inclusive date range into consecutive windows of at most `days` days.
+
+    Args:
+        start (date): The first day of the range.
+        end (date): The last day of the range.
+        days (int): The maximum number of days per window.
+
+    Returns:
+        List[Tuple[date, date]]: The inclusive start and end day of every window.
+
+    Raises:
+        ValueError: If the range is empty or `days` is smaller than 1.
+    """
+    if end < start:
+        raise ValueError("The end date must not be before the start date.")
+    if days < 1:
+        raise ValueError("Windows must span at least one day.")
+    windows = []
+    while start <= end:
+        window_end = min(start + timedelta(days=days - 1), end)
+        windows.append((start, window_end))
+        start = window_end + timedelta(days=1)
+    return windows
+
+
+def _batches(values: Sequence[str], size: int) -> Iterator[Sequence[str]]:
+    """
+    Split values into consecutive batches of at most `size` values.
+
+    Args:
+        values (Sequence[str]): The values.
+        size (int): The maximum batch size.
+
+    Yields:
+        Sequence[str]: The batches.
+    """
+    for index in range(0, len(values), size):
+        yield values[index:index + size]
+
+
+def analytics_key(element: Dict[str, Any]) -> Tuple:
+    """
+    Build the identity of an analytics element from its pivot values and date range.
+
+    Args:
+        element (Dict[str, Any]): The analytics element.
+
+    Returns:
+        Tuple: The key used to deduplicate elements across shards.
+    """
+    date_range = element.get('dateRange', {})
+    start = date_range.get('start', {})
+    return (tuple(element.get('pivotValues', [])), start.get('year'), start.get('month'), start.get('day'))
+
+
+def analytics_fields(fields: Sequence[str]) -> List[str]:
+    """
+    Add the fields identifying an analytics element to the requested metrics.
+
+    Args:
+        fields (Sequence[str]): The requested metrics.
+
+    Returns:
+        List[str]: The metrics, preceded by 'pivotValues' and 'dateRange'.
+    """
+    return list(dict.fromkeys([*KEY_FIELDS, *fields]))
+
+
+def _add_metrics(total: Dict[str, Any], element: Dict[str, Any]) -> None:
+    """
+    Add the metrics of an element to another element with the same pivot value and date range.
+
+    Numbers are added, and so are the decimal strings LinkedIn uses for costs. Metrics that cannot
+    be added, such as reach, are set to None.
+
+    Args:
+        total (Dict[str, Any]): The element to add to.
+        element (Dict[str, Any]): The element whose metrics are added.
+    """
+    for name, value in element.items():
+        if name in KEY_FIELDS:
+            continue
+        current = total.get(name)
+        if name in NON_ADDITIVE_METRICS:
+            total[name] = None
+        elif current is None:
+            total[name] = value
+        elif isinstance(current, (int, float)) and isinstance(value, (int, float)):
+            total[name] = current + value
+        elif isinstance(current, str) and isinstance(value, str):
+            try:
+                total[name] = str(Decimal(current) + Decimal(value))
+            except InvalidOperation:
+                pass
+
+
+def fetch_ad_analytics(access_token: str, start_date: date, end_date: date, pivot: str = 'CAMPAIGN',
+                       time_granularity: str = 'DAILY', campaigns: Optional[Sequence[str]] = None,
+                       accounts: Optional[Sequence[str]] = None, fields: Optional[Sequence[str]] = None,
+                       window_days: int = DEFAULT_WINDOW_DAYS, batch_size: int = DEFAULT_BATCH_SIZE,
+                       max_workers: int = DEFAULT_MAX_WORKERS) -> List[Dict[str, Any]]:
+    """
+    Fetch ad analytics for many campaigns or accounts over a long date range.
+
+    The query is split into one shard per date window and batch of campaign (or, if no campaigns
+    are given, account) URNs. Date windows are only used with DAILY granularity, since splitting
+    a range would change the buckets of coarser granularities. Shards are fetched by a pool of
+    worker threads.
+
+    When the pivot is the facet's own dimension, e.g. a CAMPAIGN pivot over campaign batches, an
+    element returned by several shards is kept once. Otherwise, e.g. for a MEMBER_COMPANY pivot,
+    each shard only holds part of an element's totals, so the metrics of elements with the same
+    pivot value and date range are added up.
+
+    Args:
+        access_token (str): The OAuth access token for LinkedIn API authentication.
+        start_date (date): The first day of the report.
+        end_date (date): The last day of the report.
+        pivot (str): The pivot of the report, e.g. 'CAMPAIGN' or 'CREATIVE'.
+        time_granularity (str): One of 'DAILY', 'MONTHLY', 'YEARLY' or 'ALL'.
+        campaigns (Sequence[str], optional): URNs of the campaigns to report on.
+        accounts (Sequence[str], optional): URNs of the ad accounts to report on.
+        fields (Sequence[str], optional): Metrics to return; LinkedIn's defaults are used if not given.
+            They are validated against the known ad analytics fields, see `projection.ENDPOINT_FIELDS`,
+            and 'pivotValues' and 'dateRange' are always requested with them.
+        window_days (int): Maximum number of days per shard for DAILY reports.
+        batch_size (int): Maximum number of campaign or account URNs per shard.
+        max_workers (int): Number of shards to fetch concurrently.
+
+    Returns:
+        List[Dict[str, Any]]: The merged analytics elements, in shard order.
+
+    Raises:
+        ValueError: If neither campaigns nor accounts are given, or if a field is unknown.
+    """
+    if campaigns:
+        facet, urns = 'campaigns', list(dict.fromkeys(campaigns))
+    elif accounts:
+        facet, urns = 'accounts', list(dict.fromkeys(accounts))
+    else:
+        raise ValueError("Either campaigns or accounts must be given.")
+
+    if time_granularity == 'DAILY':
+        windows = date_windows(start_date, end_date, window_days)
+    else:
+        windows = [(start_date, end_date)]
+
+    base_params = {
+        'q': 'analytics',
+        'pivot': pivot,
+        'timeGranularity': time_granularity,
+        'fields': linkedin_projection(ANALYTICS_ENDPOINT, analytics_fields(fields)) if fields else None
+    }
+
+    def fetch_shard(shard: Tuple[Tuple[date, date], Sequence[str]]) -> List[Dict[str, Any]]:
+        (window_start, window_end), batch = shard
+        params = dict(base_params, dateRange=restli_date_range(window_start, window_end), **{facet: restli_list(batch)})
+        response = linkedin_get_request(ANALYTICS_ENDPOINT, access_token, params=params)
+        return decode_response(response).get('elements', [])
+
+    shards = list(product(windows, _batches(urns, batch_size)))
+    additive = FACET_PIVOTS[facet] != pivot
+    merged: Dict[Tuple, Dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for shard_elements in executor.map(fetch_shard, shards):
+            for element in shard_elements:
+                key = analytics_key(element)
+                if key not in merged:
+                    merged[key] = element
+                elif additive:
+                    _add_metrics(merged[key], element)
+    return list(merged.values())
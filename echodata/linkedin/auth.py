@@ -1,9 +1,9 @@
 import time
 from urllib.parse import quote_plus, urlencode
 
-import requests
-
+from ..common.utils import make_request
 from .token import LinkedInToken
+from .constants import LINKEDIN_OAUTH_URL
 
 
 def generate_auth_url(client_id: str, redirect_uri: str):
@@ -14,11 +14,11 @@ def generate_auth_url(client_id: str, redirect_uri: str):
                 'state': None,
                 'scope': 'r_ads_reporting r_ads r_liteprofile r_emailaddress'
             }
-    _authorization_url = f"https://www.linkedin.com/oauth/v2/authorization?{urlencode(params, quote_via=quote_plus)}"
+    _authorization_url = f"{LINKEDIN_OAUTH_URL}/authorization?{urlencode(params, quote_via=quote_plus)}"
     return _authorization_url
 
 def exchange_code_for_token(client_id: str, client_secret: str, redirect_uri: str, auth_code: str) -> LinkedInToken:
-    url = 'https://www.linkedin.com/oauth/v2/accessToken'
+    url = f'{LINKEDIN_OAUTH_URL}/accessToken'
     headers = {
         'Content-Type': 'application/x-www-form-urlencoded'
     }
@@ -30,7 +30,7 @@ def exchange_code_for_token(client_id: str, client_secret: str, redirect_uri: st
         'client_id': client_id,
         'client_secret': client_secret
     }
-    response = requests.post(url, headers=headers, data=data)
+    response = make_request(url, method='POST', headers=headers, data=data, raise_for_status=False)
     if response.status_code == 200:
         return LinkedInToken(scope=str(response.json()['scope']), value=str(response.json()['access_token']), expiration_timestamp=str(time.time() + response.json()['expires_in']), refresh_value=str(response.json()['refresh_token']), refresh_expiration_timestamp=str(time.time() + response.json()['refresh_token_expires_in']))
     else:
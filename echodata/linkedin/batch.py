@@ -0,0 +1,107 @@
+"""
+This module looks up many LinkedIn entities with Rest.li batch GET requests.
+
+Instead of one request per campaign, creative or URN, ids are grouped into `ids=List(...)`
+requests of up to the endpoint's batch limit, which are sent concurrently. Failures are reported
+per id, so one bad id or one failed batch does not lose the rest of the results.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from ..common.cache import ResponseCache
+from ..common.decode import decode_response
+from .projection import linkedin_projection
+from .restli import encode_value, restli_list
+from .utils import linkedin_get_request
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_WORKERS = 8
+
+
+class BatchResult(NamedTuple):
+    """
+    The outcome of a batch lookup.
+
+    Attributes:
+        results (Dict[Any, Any]): The entities that were found, keyed by the requested id.
+        errors (Dict[Any, Any]): The error reported for every id that could not be fetched.
+    """
+    results: Dict[Any, Any]
+    errors: Dict[Any, Any]
+
+
+def _fetch_batch(endpoint: str, access_token: str, batch: Sequence[Any], params: Optional[Dict[str, Any]],
+                 cache: Optional[ResponseCache], fields: Optional[Sequence[str]] = None) -> BatchResult:
+    """
+    Fetch one batch of ids.
+
+    Args:
+        endpoint (str): The API endpoint to be appended to the base URL.
+        access_token (str): The OAuth access token for LinkedIn API authentication.
+        batch (Sequence[Any]): The ids of the batch.
+        params (Dict[str, Any], optional): Further URL parameters for the request.
+        cache (ResponseCache, optional): The cache to serve and store the response with.
+        fields (Sequence[str], optional): Dotted paths of the entity fields to return.
+
+    Returns:
+        BatchResult: The entities and errors of the batch.
+    """
+    import requests  # pylint: disable=import-outside-toplevel
+
+    batch_params = dict(params or {}, ids=restli_list(batch))
+    try:
+        data = decode_response(linkedin_get_request(endpoint, access_token, params=batch_params, cache=cache,
+                                                    fields=fields))
+    except requests.RequestException as e:
+        return BatchResult({}, {entity_id: str(e) for entity_id in batch})
+
+    results, errors = {}, {}
+    found = data.get('results', {})
+    failed = data.get('errors', {})
+    for entity_id in batch:
+        for response_key in (str(entity_id), encode_value(entity_id)):
+            if response_key in found:
+                results[entity_id] = found[response_key]
+                break
+            if response_key in failed:
+                errors[entity_id] = failed[response_key]
+                break
+        else:
+            errors[entity_id] = 'Not returned by the batch request.'
+    return BatchResult(results, errors)
+
+
+def linkedin_batch_get(endpoint: str, access_token: str, ids: Iterable[Any], params: Optional[Dict[str, Any]] = None,
+                       batch_size: int = DEFAULT_BATCH_SIZE, max_workers: int = DEFAULT_MAX_WORKERS,
+                       cache: Optional[ResponseCache] = None, fields: Optional[Sequence[str]] = None) -> BatchResult:
+    """
+    Look up many entities of an endpoint with concurrent batch GET requests.
+
+    Args:
+        endpoint (str): The API endpoint to be appended to the base URL, e.g. '/adCampaigns'.
+        access_token (str): The OAuth access token for LinkedIn API authentication.
+        ids (Iterable[Any]): The ids or URNs to look up. Duplicates are fetched once.
+        params (Dict[str, Any], optional): Further URL parameters for every request.
+        batch_size (int): Maximum number of ids per request.
+        max_workers (int): Number of batches to fetch concurrently.
+        cache (ResponseCache, optional): The cache to serve and store the responses with.
+        fields (Sequence[str], optional): Dotted paths of the entity fields to return, e.g. ['id', 'name'].
+
+    Returns:
+        BatchResult: The entities that were found and the errors of those that were not, keyed by id.
+
+    Raises:
+        ValueError: If a field is unknown for the endpoint.
+    """
+    if fields:
+        linkedin_projection(endpoint, fields)  # Fail on unknown fields before any request is sent
+    unique_ids: List[Any] = list(dict.fromkeys(ids))
+    batches = [unique_ids[index:index + batch_size] for index in range(0, len(unique_ids), batch_size)]
+
+    results, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for batch_result in executor.map(
+                lambda batch: _fetch_batch(endpoint, access_token, batch, params, cache, fields), batches):
+            results.update(batch_result.results)
+            errors.update(batch_result.errors)
+    return BatchResult(results, errors)
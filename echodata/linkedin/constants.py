@@ -0,0 +1,17 @@
+"""
+This module holds the LinkedIn API endpoints and headers.
+
+It has no dependencies, so light modules such as `echodata.linkedin.token` can use the
+constants without importing the request machinery of `echodata.linkedin.utils`.
+"""
+import os
+from urllib.parse import urlsplit
+
+# The base URLs can be pointed at a stand-in server, e.g. for benchmarks
+LINKEDIN_API_URL = os.environ.get('ECHODATA_LINKEDIN_API_URL', 'https://api.linkedin.com/rest')
+LINKEDIN_OAUTH_URL = os.environ.get('ECHODATA_LINKEDIN_OAUTH_URL', 'https://www.linkedin.com/oauth/v2')
+LINKEDIN_API_HOST = urlsplit(LINKEDIN_API_URL).hostname
+LINKEDIN_HEADERS = {
+    'Linkedin-Version': '202305',
+    'X-Restli-Protocol-Version': '2.0.0'
+}
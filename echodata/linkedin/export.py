@@ -0,0 +1,44 @@
+"""
+This module exports paginated LinkedIn API collections straight to NDJSON, CSV or Parquet files.
+"""
+from typing import Optional, Sequence
+
+from ..common.export import DEFAULT_CHUNK_SIZE, export_elements, read_checkpoint
+from ..common.frames import Column
+from .utils import iter_linkedin_elements
+
+
+def export_linkedin_report(endpoint: str, access_token: str, params: dict, path: str, fmt: str = 'parquet',
+                           schema: Optional[Sequence[Column]] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                           compression: Optional[str] = None, resume: bool = True, max_count: int = 1000,
+                           max_workers: int = 1, fields: Optional[Sequence[str]] = None) -> int:
+    """
+    Export a paginated LinkedIn API collection in fixed-size chunks.
+
+    If a previous export to the same path was interrupted and `resume` is set, pagination
+    restarts at the first row that was not committed and the output is appended to.
+
+    Args:
+        endpoint (str): The API endpoint to be appended to the base URL.
+        access_token (str): The OAuth access token for LinkedIn API authentication.
+        params (dict): Initial URL parameters for the request.
+        path (str): The output file, or the output directory for Parquet.
+        fmt (str): One of 'ndjson', 'csv' or 'parquet'.
+        schema (Sequence[Column], optional): The columns of CSV and Parquet exports, inferred from the first chunk if not given.
+        chunk_size (int): Number of elements per chunk.
+        compression (str, optional): 'gzip' for NDJSON and CSV, or a Parquet codec such as 'snappy' or 'zstd'.
+        resume (bool): Whether to resume an interrupted export instead of starting over.
+        max_count (int): Maximum number of items to retrieve per request.
+        max_workers (int): Number of pages to fetch concurrently.
+        fields (Sequence[str], optional): Dotted paths of the element fields to request, e.g.
+            `schema_fields(schema)` to download only what the schema reads.
+
+    Returns:
+        int: The total number of exported rows.
+    """
+    checkpoint = read_checkpoint(path) if resume else None
+    start = checkpoint['rows'] if checkpoint is not None else 0
+    elements = iter_linkedin_elements(endpoint, access_token, params, max_count=max_count, start=start,
+                                      max_workers=max_workers, fields=fields)
+    return export_elements(elements, path, fmt=fmt, schema=schema, chunk_size=chunk_size, compression=compression,
+                           checkpoint=checkpoint)
@@ -0,0 +1,84 @@
+"""
+This module loads paginated LinkedIn API results straight into pandas DataFrames or Arrow tables.
+
+It also declares schemas for common LinkedIn collections, which flatten their URN references to
+ids and give metrics numeric types.
+"""
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+from ..common.frames import Column, pages_to_arrow, pages_to_dataframe
+from .utils import iter_linkedin_pages
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+AD_ANALYTICS_SCHEMA = [
+    Column('pivot_value', 'pivotValues.0', 'urn'),
+    Column('start_year', 'dateRange.start.year', 'int'),
+    Column('start_month', 'dateRange.start.month', 'int'),
+    Column('start_day', 'dateRange.start.day', 'int'),
+    Column('impressions', 'impressions', 'int'),
+    Column('clicks', 'clicks', 'int'),
+    Column('cost_in_local_currency', 'costInLocalCurrency', 'float'),
+    Column('external_website_conversions', 'externalWebsiteConversions', 'int')
+]
+
+CAMPAIGN_SCHEMA = [
+    Column('id', 'id', 'int'),
+    Column('name', 'name', 'str'),
+    Column('account', 'account', 'urn'),
+    Column('campaign_group', 'campaignGroup', 'urn'),
+    Column('status', 'status', 'str'),
+    Column('type', 'type', 'str'),
+    Column('cost_type', 'costType', 'str'),
+    Column('daily_budget', 'dailyBudget.amount', 'float'),
+    Column('currency', 'dailyBudget.currencyCode', 'str'),
+    Column('created_at', 'changeAuditStamps.created.time', 'timestamp'),
+    Column('last_modified_at', 'changeAuditStamps.lastModified.time', 'timestamp')
+]
+
+
+def linkedin_dataframe(endpoint: str, access_token: str, params: dict, schema: Optional[Sequence[Column]] = None,
+                       max_count: int = 1000, max_workers: int = 1, fields: Optional[Sequence[str]] = None) -> 'pd.DataFrame':
+    """
+    Fetch a paginated LinkedIn API collection into a pandas DataFrame, page by page.
+
+    Args:
+        endpoint (str): The API endpoint to be appended to the base URL.
+        access_token (str): The OAuth access token for LinkedIn API authentication.
+        params (dict): Initial URL parameters for the request.
+        schema (Sequence[Column], optional): The columns of the output, inferred from the first page if not given.
+        max_count (int): Maximum number of items to retrieve per request.
+        max_workers (int): Number of pages to fetch concurrently.
+        fields (Sequence[str], optional): Dotted paths of the element fields to request, e.g.
+            `schema_fields(schema)` to download only what the schema reads.
+
+    Returns:
+        pandas.DataFrame: The typed, flattened elements of the collection.
+    """
+    pages = iter_linkedin_pages(endpoint, access_token, params, max_count=max_count, max_workers=max_workers,
+                                fields=fields)
+    return pages_to_dataframe(pages, schema)
+
+
+def linkedin_arrow_table(endpoint: str, access_token: str, params: dict, schema: Optional[Sequence[Column]] = None,
+                         max_count: int = 1000, max_workers: int = 1, fields: Optional[Sequence[str]] = None) -> Any:
+    """
+    Fetch a paginated LinkedIn API collection into an Arrow table, page by page.
+
+    Args:
+        endpoint (str): The API endpoint to be appended to the base URL.
+        access_token (str): The OAuth access token for LinkedIn API authentication.
+        params (dict): Initial URL parameters for the request.
+        schema (Sequence[Column], optional): The columns of the output, inferred from the first page if not given.
+        max_count (int): Maximum number of items to retrieve per request.
+        max_workers (int): Number of pages to fetch concurrently.
+        fields (Sequence[str], optional): Dotted paths of the element fields to request, e.g.
+            `schema_fields(schema)` to download only what the schema reads.
+
+    Returns:
+        pyarrow.Table: The typed, flattened elements of the collection.
+    """
+    pages = iter_linkedin_pages(endpoint, access_token, params, max_count=max_count, max_workers=max_workers,
+                                fields=fields)
+    return pages_to_arrow(pages, schema)
@@ -0,0 +1,242 @@
+"""
+This module runs many LinkedIn export jobs across a pool of worker processes.
+
+A job spec lists the reports to export, e.g. one per ad account. Jobs are spread over worker
+processes so that JSON decoding and columnar conversion use every core. Every worker opens its
+own pooled HTTP session, and all workers draw from one application rate-limit bucket in shared
+memory. Member rate limits are kept by each worker on its own. The status of every job is written
+to a JSON file as soon as it finishes.
+"""
+import json
+import logging
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from ..common.export import export_elements
+from ..common.files import atomic_write
+from ..common.ratelimit import SharedTokenBucket, configure_rate_limits
+from ..common.session import configure_session
+from .analytics import fetch_ad_analytics
+from .export import export_linkedin_report
+from .frames import AD_ANALYTICS_SCHEMA, CAMPAIGN_SCHEMA
+from .projection import schema_fields
+from .token_store import TokenStore, open_token_store
+
+logger = logging.getLogger(__name__)
+
+SCHEMAS = {
+    'ad_analytics': AD_ANALYTICS_SCHEMA,
+    'campaigns': CAMPAIGN_SCHEMA
+}
+
+
+class Job(NamedTuple):
+    """
+    One report to export.
+
+    Attributes:
+        name (str): Unique name of the job, used for its status file, so it cannot contain path separators.
+        output (str): The output file, or the output directory for Parquet.
+        kind (str): 'collection' for a paginated endpoint, or 'analytics' for an ad analytics report.
+        token_key (str): Key of the job's token in the token store.
+        access_token (str): Access token to use instead of the token store.
+        endpoint (str): The endpoint of a 'collection' job.
+        params (Dict[str, Any]): URL parameters of a 'collection' job.
+        accounts (List[str]): Ad account URNs of an 'analytics' job.
+        campaigns (List[str]): Campaign URNs of an 'analytics' job.
+        start_date (str): First day of an 'analytics' job in ISO format.
+        end_date (str): Last day of an 'analytics' job in ISO format.
+        pivot (str): Pivot of an 'analytics' job.
+        fields (List[str]): Metrics of an 'analytics' job, or element fields of a 'collection' job. Collection
+            jobs with a schema only request the fields the schema reads by default.
+        format (str): One of 'ndjson', 'csv' or 'parquet'.
+        schema (str): Name of a schema in `SCHEMAS` for CSV and Parquet output.
+        compression (str): The compression of the output.
+    """
+    name: str
+    output: str
+    kind: str = 'collection'
+    token_key: Optional[str] = None
+    access_token: Optional[str] = None
+    endpoint: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
+    accounts: Optional[List[str]] = None
+    campaigns: Optional[List[str]] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    pivot: str = 'CAMPAIGN'
+    fields: Optional[List[str]] = None
+    format: str = 'parquet'
+    schema: Optional[str] = None
+    compression: Optional[str] = None
+
+
+def load_jobs(filepath: str) -> List[Job]:
+    """
+    Load a job spec file.
+
+    The file holds a JSON object with a `jobs` list and optional `defaults` applied to every job.
+
+    Args:
+        filepath (str): The path of the job spec.
+
+    Returns:
+        List[Job]: The jobs.
+    """
+    with open(filepath, 'r') as spec_file:
+        spec = json.load(spec_file)
+    defaults = spec.get('defaults', {})
+    return [Job(**dict(defaults, **job)) for job in spec['jobs']]
+
+
+_token_store: Optional[TokenStore] = None
+
+
+def _init_worker(token_store_path: Optional[str], bucket: Optional[SharedTokenBucket],
+                 member_rate: Optional[float]) -> None:
+    """
+    Prepare a worker process: open its own HTTP session and join the shared rate limit.
+
+    Args:
+        token_store_path (str, optional): The path of the token store.
+        bucket (SharedTokenBucket, optional): The application bucket shared by all workers.
+        member_rate (float, optional): Requests per second allowed per member.
+    """
+    global _token_store
+    configure_session()
+    configure_rate_limits(member_rate=member_rate, application_bucket=bucket)
+    _token_store = open_token_store(token_store_path) if token_store_path else None
+
+
+def _access_token(job: Job) -> str:
+    """
+    Get the access token of a job.
+
+    Args:
+        job (Job): The job.
+
+    Returns:
+        str: The access token.
+
+    Raises:
+        KeyError: If the job's token is not in the token store.
+        ValueError: If the job names no token.
+    """
+    if job.access_token:
+        return job.access_token
+    if job.token_key and _token_store is not None:
+        token = _token_store.get(job.token_key)
+        if token is None:
+            raise KeyError(f"No token found for '{job.token_key}'.")
+        return token.value
+    raise ValueError(f"Job '{job.name}' has neither an access token nor a token key.")
+
+
+def _check_names(jobs: List[Job]) -> None:
+    """
+    Check that job names are unique and can be used as file names.
+
+    Args:
+        jobs (List[Job]): The jobs.
+
+    Raises:
+        ValueError: If a name is empty, contains a path separator, or is used by several jobs.
+    """
+    seen = set()
+    for job in jobs:
+        name = job.name
+        if not name or name in ('.', '..') or '/' in name or '\\' in name:
+            raise ValueError(f"Invalid job name '{name}': job names are used as file names.")
+        if name in seen:
+            raise ValueError(f"Duplicate job name '{name}'.")
+        seen.add(name)
+
+
+def run_job(job: Job) -> Dict[str, Any]:
+    """
+    Run one job and report its status. Failures are reported, not raised.
+
+    Args:
+        job (Job): The job.
+
+    Returns:
+        Dict[str, Any]: The job's name, status, number of rows, duration and error, if any.
+    """
+    started = time.time()
+    status = {'name': job.name, 'output': job.output, 'pid': os.getpid(), 'started_at': started}
+    try:
+        access_token = _access_token(job)
+        schema = SCHEMAS[job.schema] if job.schema else None
+        if job.kind == 'analytics':
+            elements = fetch_ad_analytics(access_token, date.fromisoformat(job.start_date),
+                                          date.fromisoformat(job.end_date), pivot=job.pivot,
+                                          campaigns=job.campaigns, accounts=job.accounts, fields=job.fields)
+            rows = export_elements(elements, job.output, fmt=job.format, schema=schema, compression=job.compression)
+        elif job.kind == 'collection':
+            fields = job.fields or (schema_fields(schema) if schema else None)
+            rows = export_linkedin_report(job.endpoint, access_token, job.params or {}, job.output, fmt=job.format,
+                                          schema=schema, compression=job.compression, fields=fields)
+        else:
+            raise ValueError(f"Unknown job kind '{job.kind}'.")
+        status.update(status='ok', rows=rows)
+    except Exception as e:  # pylint: disable=broad-except
+        status.update(status='failed', error=str(e), traceback=traceback.format_exc())
+    status['seconds'] = time.time() - started
+    return status
+
+
+def run_jobs(jobs: List[Job], status_dir: str, token_store_path: Optional[str] = None, max_workers: Optional[int] = None,
+             application_rate: Optional[float] = None, application_burst: Optional[float] = None,
+             member_rate: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Run jobs on a pool of worker processes, writing the status of every job as it finishes.
+
+    The summary is written even if the pool breaks, e.g. because a worker was killed; it then lists
+    the jobs that did not finish.
+
+    Args:
+        jobs (List[Job]): The jobs.
+        status_dir (str): Directory receiving `<job name>.status.json` files and a `summary.json`.
+        token_store_path (str, optional): The path of the token store holding the jobs' tokens, see `open_token_store`.
+        max_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        application_rate (float, optional): Requests per second allowed across all workers.
+        application_burst (float, optional): Burst size of the shared application bucket.
+        member_rate (float, optional): Requests per second allowed per member within each worker. Workers
+            do not share member buckets, so a member running jobs on N workers may send up to N times this
+            rate; divide it by the number of workers to cap members across the pool.
+
+    Returns:
+        List[Dict[str, Any]]: The status of every job, in completion order.
+
+    Raises:
+        ValueError: If a job name is invalid or not unique.
+        concurrent.futures.process.BrokenProcessPool: If a worker process died.
+    """
+    _check_names(jobs)
+    os.makedirs(status_dir, exist_ok=True)
+    bucket = SharedTokenBucket(application_rate, application_burst) if application_rate else None
+    statuses = []
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(token_store_path, bucket, member_rate)) as executor:
+            futures = [executor.submit(run_job, job) for job in jobs]
+            for future in as_completed(futures):
+                status = future.result()
+                atomic_write(os.path.join(status_dir, f"{status['name']}.status.json"), json.dumps(status, indent=4))
+                logger.info("%s: %s (%d rows, %.1fs)", status['name'], status['status'], status.get('rows', 0),
+                            status['seconds'])
+                statuses.append(status)
+    finally:
+        finished = {status['name'] for status in statuses}
+        summary = {
+            'jobs': len(statuses),
+            'failed': [status['name'] for status in statuses if status['status'] != 'ok'],
+            'unfinished': [job.name for job in jobs if job.name not in finished],
+            'rows': sum(status.get('rows', 0) for status in statuses)
+        }
+        atomic_write(os.path.join(status_dir, 'summary.json'), json.dumps(summary, indent=4))
+    return statuses
@@ -0,0 +1,193 @@
+"""
+This module restricts LinkedIn API responses to the fields a caller needs.
+
+Wanted fields are given as dotted paths, e.g. 'dailyBudget.amount', and sent as a Rest.li
+`fields` projection, so LinkedIn only serializes, and echodata only downloads and decodes, those
+fields. Paths are validated against the known fields of common collections before any request is
+sent, so a typo fails fast instead of silently returning empty columns.
+"""
+import functools
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from ..common.frames import Column
+from .restli import field_tree, restli_projection
+
+# Known fields of common collections. '*' stands for a record whose subfields are not listed.
+ENDPOINT_FIELDS: Dict[str, List[str]] = {
+    'adAccounts': [
+        'id', 'name', 'currency', 'status', 'type', 'reference', 'test', 'servingStatuses',
+        'notifiedOnCampaignOptimization', 'notifiedOnCreativeApproval', 'notifiedOnCreativeRejection',
+        'notifiedOnEndOfCampaign', 'notifiedOnNewFeaturesEnabled', 'version.versionTag',
+        'changeAuditStamps.created.time', 'changeAuditStamps.lastModified.time',
+        'totalBudget.amount', 'totalBudget.currencyCode'
+    ],
+    'adCampaignGroups': [
+        'id', 'account', 'name', 'status', 'test', 'backfilled', 'servingStatuses', 'objectiveType',
+        'allowedCampaignTypes', 'budgetOptimization.*', 'runSchedule.start', 'runSchedule.end',
+        'totalBudget.amount', 'totalBudget.currencyCode', 'dailyBudget.amount', 'dailyBudget.currencyCode',
+        'changeAuditStamps.created.time', 'changeAuditStamps.lastModified.time'
+    ],
+    'adCampaigns': [
+        'id', 'account', 'campaignGroup', 'associatedEntity', 'name', 'status', 'type', 'format', 'test',
+        'costType', 'creativeSelection', 'objectiveType', 'optimizationTargetType', 'pacingStrategy',
+        'politicalIntent', 'servingStatuses', 'offsiteDeliveryEnabled', 'audienceExpansionEnabled',
+        'storyDeliveryEnabled', 'connectedTelevisionOnly', 'locale.country', 'locale.language',
+        'runSchedule.start', 'runSchedule.end', 'dailyBudget.amount', 'dailyBudget.currencyCode',
+        'totalBudget.amount', 'totalBudget.currencyCode', 'unitCost.amount', 'unitCost.currencyCode',
+        'targetingCriteria.*', 'offsitePreferences.*', 'version.versionTag',
+        'changeAuditStamps.created.time', 'changeAuditStamps.lastModified.time'
+    ],
+    'creatives': [
+        'id', 'account', 'campaign', 'name', 'intendedStatus', 'isServing', 'isTest', 'servingHoldReasons',
+        'createdAt', 'createdBy', 'lastModifiedAt', 'lastModifiedBy', 'content.*', 'inlineContent.*',
+        'leadgenCallToAction.*', 'review.*'
+    ],
+    # Ad analytics only accepts top-level fields: the metrics, 'dateRange' and 'pivotValues'
+    'adAnalytics': [
+        'dateRange', 'pivotValues', 'impressions', 'clicks', 'costInLocalCurrency', 'costInUsd',
+        'externalWebsiteConversions', 'externalWebsitePostClickConversions', 'externalWebsitePostViewConversions',
+        'conversionValueInLocalCurrency', 'landingPageClicks', 'likes', 'comments', 'shares', 'follows',
+        'reactions', 'totalEngagements', 'otherEngagements', 'companyPageClicks', 'actionClicks', 'adUnitClicks',
+        'textUrlClicks', 'videoViews', 'videoStarts', 'videoFirstQuartileCompletions',
+        'videoMidpointCompletions', 'videoThirdQuartileCompletions', 'videoCompletions', 'fullScreenPlays',
+        'oneClickLeads', 'oneClickLeadFormOpens', 'leadGenerationMailContactInfoShares',
+        'leadGenerationMailInterestedClicks', 'approximateMemberReach', 'averageDwellTime', 'cardClicks',
+        'cardImpressions', 'opens', 'sends', 'viralImpressions', 'viralClicks', 'viralLikes', 'viralComments',
+        'viralShares', 'viralFollows', 'viralTotalEngagements', 'viralVideoViews', 'viralVideoCompletions'
+    ]
+}
+
+_endpoint_trees: Dict[str, Dict[str, Optional[dict]]] = {}
+
+
+def register_endpoint_fields(collection: str, fields: Iterable[str]) -> None:
+    """
+    Declare the known fields of a collection, replacing any previous declaration.
+
+    Args:
+        collection (str): The collection name, e.g. 'adCampaigns'.
+        fields (Iterable[str]): Dotted field paths. A '*' segment allows any subfield, e.g. 'content.*'.
+    """
+    ENDPOINT_FIELDS[collection] = list(fields)
+    _endpoint_trees.pop(collection, None)
+    _linkedin_projection.cache_clear()
+
+
+def endpoint_collection(endpoint: str) -> str:
+    """
+    Get the collection an endpoint addresses, skipping entity keys.
+
+    Args:
+        endpoint (str): The endpoint, e.g. '/adAccounts/123/adCampaigns' or '/adCampaigns/456'.
+
+    Returns:
+        str: The collection name, e.g. 'adCampaigns'.
+    """
+    segments = [segment for segment in endpoint.split('?', 1)[0].split('/') if segment]
+    for segment in reversed(segments):
+        if not segment.isdigit() and not any(char in segment for char in ':%('):
+            return segment
+    return ''
+
+
+def _known_tree(collection: str) -> Optional[Dict[str, Optional[dict]]]:
+    """
+    Get the field tree of a collection's known fields.
+
+    Args:
+        collection (str): The collection name.
+
+    Returns:
+        Dict[str, Optional[dict]]: The tree, or None if the collection has no known fields.
+    """
+    tree = _endpoint_trees.get(collection)
+    if tree is None and collection in ENDPOINT_FIELDS:
+        tree = _endpoint_trees[collection] = field_tree(ENDPOINT_FIELDS[collection])
+    return tree
+
+
+def _unknown_fields(tree: Dict[str, Optional[dict]], known: Dict[str, Optional[dict]], prefix: str = '') -> List[str]:
+    """
+    Collect the paths of a projection tree that are not part of a tree of known fields.
+
+    Args:
+        tree (Dict[str, Optional[dict]]): The requested fields.
+        known (Dict[str, Optional[dict]]): The known fields.
+        prefix (str): The path of the trees' parent field.
+
+    Returns:
+        List[str]: The unknown paths.
+    """
+    unknown = []
+    for name, subtree in tree.items():
+        path = f'{prefix}{name}'
+        if name not in known:
+            unknown.append(path)
+        elif subtree is not None:
+            subfields = known[name]
+            if subfields is None:
+                unknown.extend(f'{path}.{subname}' for subname in subtree)  # A scalar has no subfields
+            elif '*' not in subfields:
+                unknown.extend(_unknown_fields(subtree, subfields, f'{path}.'))
+    return unknown
+
+
+def validate_fields(endpoint: str, fields: Sequence[str]) -> None:
+    """
+    Check that fields are known fields of an endpoint's collection.
+
+    Collections without declared fields are not checked.
+
+    Args:
+        endpoint (str): The API endpoint.
+        fields (Sequence[str]): Dotted field paths.
+
+    Raises:
+        ValueError: If a field is unknown, or selects subfields of a field that has none.
+    """
+    collection = endpoint_collection(endpoint)
+    known = _known_tree(collection)
+    if known is None:
+        return
+    unknown = _unknown_fields(field_tree(fields), known)
+    if unknown:
+        raise ValueError(f"Unknown fields for {collection}: {', '.join(unknown)}. "
+                         f"Known fields: {', '.join(sorted(known))}.")
+
+
+@functools.lru_cache(maxsize=256)
+def _linkedin_projection(endpoint: str, fields: Tuple[str, ...]) -> str:
+    validate_fields(endpoint, fields)
+    return restli_projection(fields)
+
+
+def linkedin_projection(endpoint: str, fields: Union[str, Sequence[str]]) -> str:
+    """
+    Validate fields for an endpoint and encode them as the value of its `fields` parameter.
+
+    Projections are cached, so calling this for every page of a collection costs a lookup.
+
+    Args:
+        endpoint (str): The API endpoint.
+        fields (Union[str, Sequence[str]]): A dotted field path or a sequence of them.
+
+    Returns:
+        str: The Rest.li projection, e.g. `id,dailyBudget:(amount,currencyCode)`.
+
+    Raises:
+        ValueError: If a field is unknown for the endpoint's collection.
+    """
+    return _linkedin_projection(endpoint, (fields,) if isinstance(fields, str) else tuple(fields))
+
+
+def schema_fields(schema: Sequence[Column]) -> List[str]:
+    """
+    Get the top-level fields a columnar schema reads, to request nothing else.
+
+    Args:
+        schema (Sequence[Column]): The columns, e.g. `CAMPAIGN_SCHEMA`.
+
+    Returns:
+        List[str]: The top-level field names, in column order.
+    """
+    return list(dict.fromkeys(column.path.split('.', 1)[0] for column in schema))
@@ -0,0 +1,213 @@
+"""
+This module resolves LinkedIn URNs to entities while collapsing duplicate and concurrent lookups.
+
+Fan-out enrichment jobs look up the same few hundred URNs over and over from many threads. The
+`URNResolver` remembers resolved entities, shares one in-flight lookup between threads asking for
+the same URN, and gathers the lookups arriving within a short window into batch GET requests.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..common.singleflight import SingleFlight
+from .batch import linkedin_batch_get
+
+DEFAULT_WINDOW = 0.01
+DEFAULT_MAX_BATCH = 100
+DEFAULT_MAX_CACHED = 10000
+
+URN_ENDPOINTS = {
+    'sponsoredAccount': '/adAccounts',
+    'sponsoredCampaignGroup': '/adCampaignGroups',
+    'sponsoredCampaign': '/adCampaigns',
+    'sponsoredCreative': '/creatives',
+    'organization': '/organizations'
+}
+# Entity types whose endpoints are keyed by the full URN instead of the numeric id
+URN_KEYED_TYPES = frozenset({'sponsoredCreative'})
+
+
+def parse_urn(urn: str) -> Tuple[str, str]:
+    """
+    Split a URN into its entity type and id.
+
+    Args:
+        urn (str): The URN, e.g. 'urn:li:sponsoredCampaign:123'.
+
+    Returns:
+        Tuple[str, str]: The entity type and id, e.g. ('sponsoredCampaign', '123').
+
+    Raises:
+        ValueError: If the value is not a LinkedIn URN.
+    """
+    parts = urn.split(':', 3)
+    if len(parts) != 4 or parts[0] != 'urn' or parts[1] != 'li':
+        raise ValueError(f"'{urn}' is not a LinkedIn URN.")
+    return parts[2], parts[3]
+
+
+class URNResolver:
+    """
+    Resolves URNs to entities with single-flight deduplication and micro-batching.
+
+    Attributes:
+        window (float): Seconds to wait for more lookups before sending a batch.
+        max_batch (int): Maximum number of URNs per batch request; a full batch is sent at once.
+    """
+
+    def __init__(self, access_token: str, window: float = DEFAULT_WINDOW, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_cached: int = DEFAULT_MAX_CACHED, endpoints: Optional[Dict[str, str]] = None):
+        """
+        Initialize a new URNResolver.
+
+        Args:
+            access_token (str): The OAuth access token for LinkedIn API authentication.
+            window (float): Seconds to wait for more lookups before sending a batch.
+            max_batch (int): Maximum number of URNs per batch request.
+            max_cached (int): Maximum number of resolved entities to remember.
+            endpoints (Dict[str, str], optional): Endpoint of every entity type. Defaults to `URN_ENDPOINTS`.
+        """
+        self.window = window
+        self.max_batch = max_batch
+        self.__access_token = access_token
+        self._max_cached = max_cached
+        self._endpoints = endpoints or URN_ENDPOINTS
+        self._resolved: 'OrderedDict[str, Any]' = OrderedDict()
+        self._flight = SingleFlight()
+        self._pending: Dict[str, List[Tuple[str, Future]]] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+        self._lock = threading.Lock()
+
+    def _remember(self, urn: str, entity: Any) -> None:
+        """
+        Remember a resolved entity, forgetting the least recently used ones beyond the limit.
+
+        Args:
+            urn (str): The URN.
+            entity (Any): The resolved entity.
+        """
+        with self._lock:
+            self._resolved[urn] = entity
+            self._resolved.move_to_end(urn)
+            while len(self._resolved) > self._max_cached:
+                self._resolved.popitem(last=False)
+
+    def _enqueue(self, urn: str) -> Future:
+        """
+        Add a URN to the pending batch of its entity type.
+
+        The first URN of a batch schedules its flush after `window` seconds; a batch reaching
+        `max_batch` URNs is flushed immediately, cancelling the scheduled flush.
+
+        Args:
+            urn (str): The URN.
+
+        Returns:
+            Future: Completed with the entity once the batch has been fetched.
+        """
+        entity_type, _ = parse_urn(urn)
+        if entity_type not in self._endpoints:
+            raise ValueError(f"No endpoint is known for URNs of type '{entity_type}'.")
+        future: Future = Future()
+        with self._lock:
+            pending = self._pending.setdefault(entity_type, [])
+            pending.append((urn, future))
+            if len(pending) == 1:
+                timer = self._timers[entity_type] = threading.Timer(self.window, self._flush,
+                                                                    args=(entity_type, pending))
+                timer.daemon = True
+                timer.start()
+            full = len(pending) >= self.max_batch
+        if full:
+            self._flush(entity_type, pending)
+        return future
+
+    def _flush(self, entity_type: str, batch: List[Tuple[str, Future]]) -> None:
+        """
+        Send a pending batch of an entity type and complete its futures.
+
+        Nothing is sent if the batch has already been flushed, e.g. by the timer of a batch that
+        was flushed when it became full.
+
+        Args:
+            entity_type (str): The entity type.
+            batch (List[Tuple[str, Future]]): The batch to send.
+        """
+        with self._lock:
+            if self._pending.get(entity_type) is not batch:
+                return
+            pending = self._pending.pop(entity_type)
+            timer = self._timers.pop(entity_type, None)
+        if timer is not None:
+            timer.cancel()
+
+        ids = {}
+        for urn, _ in pending:
+            ids[urn] = urn if entity_type in URN_KEYED_TYPES else parse_urn(urn)[1]
+        try:
+            result = linkedin_batch_get(self._endpoints[entity_type], self.__access_token, ids.values(),
+                                        batch_size=self.max_batch, max_workers=1)
+        except Exception as e:  # pylint: disable=broad-except
+            for _, future in pending:
+                future.set_exception(e)
+            return
+
+        for urn, future in pending:
+            entity_id = ids[urn]
+            if entity_id in result.results:
+                self._remember(urn, result.results[entity_id])
+                future.set_result(result.results[entity_id])
+            else:
+                future.set_exception(LookupError(f"Failed to resolve {urn}: {result.errors.get(entity_id)}"))
+
+    def resolve(self, urn: str) -> Any:
+        """
+        Resolve a URN to its entity.
+
+        Args:
+            urn (str): The URN, e.g. 'urn:li:sponsoredCampaign:123'.
+
+        Returns:
+            Any: The entity.
+
+        Raises:
+            LookupError: If LinkedIn did not return the entity.
+            ValueError: If the URN's entity type has no known endpoint.
+        """
+        with self._lock:
+            if urn in self._resolved:
+                self._resolved.move_to_end(urn)
+                return self._resolved[urn]
+        return self._flight.do(urn, lambda: self._enqueue(urn).result())
+
+    def resolve_many(self, urns: Iterable[str]) -> Dict[str, Any]:
+        """
+        Resolve many URNs at once, batching all lookups that are not remembered yet.
+
+        URNs that another thread is already resolving are not fetched again; their lookups are shared.
+
+        Args:
+            urns (Iterable[str]): The URNs.
+
+        Returns:
+            Dict[str, Any]: The entities of the URNs that could be resolved.
+        """
+        futures = {}
+        for urn in dict.fromkeys(urns):
+            with self._lock:
+                if urn in self._resolved:
+                    futures[urn] = self._resolved[urn]
+                    continue
+            futures[urn] = self._flight.submit(urn, lambda urn=urn: self._enqueue(urn))
+
+        entities = {}
+        for urn, future in futures.items():
+            if not isinstance(future, Future):
+                entities[urn] = future
+                continue
+            try:
+                entities[urn] = future.result()
+            except LookupError:
+                continue
+        return entities
@@ -1,38 +1,105 @@
 import configparser
-from datetime import time
+import time
+from datetime import datetime
 
-import requests
+from ..common.models.token import Token, get_clock_skew
+from ..common.utils import make_request
+from .constants import LINKEDIN_API_URL, LINKEDIN_HEADERS, LINKEDIN_OAUTH_URL
 
-from ..common.models.token import Token
+
+class RefreshTokenView:
+    """
+    A lightweight view of the refresh token stored inline in a LinkedInToken.
+    """
+    __slots__ = ('_token',)
+
+    def __init__(self, token: 'LinkedInToken'):
+        self._token = token
+
+    @property
+    def value(self) -> str:
+        return self._token.refresh_value
+
+    @value.setter
+    def value(self, value: str):
+        self._token.refresh_value = value
+
+    @property
+    def expiration_timestamp(self) -> float:
+        return self._token.refresh_expiration_timestamp
+
+    @expiration_timestamp.setter
+    def expiration_timestamp(self, expiration_timestamp: str):
+        self._token.refresh_expiration_timestamp = None if expiration_timestamp is None else float(expiration_timestamp)
+
+    @property
+    def expires_at(self) -> datetime:
+        return datetime.fromtimestamp(self._token.refresh_expiration_timestamp)
+
+    @property
+    def is_expired(self) -> bool:
+        expiration = self._token.refresh_expiration_timestamp
+        return expiration is None or time.time() + get_clock_skew() >= expiration
+
+    def show_expire_date(self) -> str:
+        return self.expires_at.strftime('%Y-%m-%d %H:%M:%S')
+
+    def __repr__(self):
+        return f"Token(value='{self.value}', expires_at='{self.expires_at}')"
 
 
 class LinkedInToken(Token):
+    VALIDATION_URL = f'{LINKEDIN_API_URL}/adAccounts?q=search&search=(status:(values:List(ACTIVE)))'
+    REFRESH_URL = f'{LINKEDIN_OAUTH_URL}/accessToken'
+    REVOKE_URL = f'{LINKEDIN_OAUTH_URL}/revoke'
+    VALIDITY_TTL = 300
+
+    __slots__ = ('_scope', 'refresh_value', 'refresh_expiration_timestamp',
+                 '_validity', '_validity_key', '_validity_expires')
+
     def __init__(self, scope:str, value:str, expiration_timestamp:str, refresh_value:str, refresh_expiration_timestamp:str):
         super().__init__(value=value, expiration_timestamp=expiration_timestamp)
-        self.__refresh_token = Token(value=refresh_value, expiration_timestamp=refresh_expiration_timestamp)
-        self.__scope = scope
+        # The refresh token is kept inline; `refresh_token` only builds a view of it on access
+        self.refresh_value = refresh_value
+        self.refresh_expiration_timestamp = float(refresh_expiration_timestamp)
+        self._scope = scope
+        self._validity = None
+        self._validity_key = None
+        self._validity_expires = 0.0
 
     @property
-    def refresh_token(self) -> Token:
-        return self.__refresh_token
+    def refresh_token(self) -> RefreshTokenView:
+        return RefreshTokenView(self)
 
     @property
-    def scope(self) -> Token:
-        return self.__scope
+    def scope(self) -> str:
+        return self._scope
 
     @property
     def is_refreshable(self) -> bool:
-        return self.is_expired and self.refresh_token.is_expired
+        expiration = self.refresh_expiration_timestamp
+        return self.refresh_value is not None and expiration is not None and time.time() + get_clock_skew() < expiration
+
+    @property
+    def cached_validity(self):
+        if self.value is not None and self._validity_key == self.value and time.time() < self._validity_expires:
+            return self._validity
+        return None
+
+    def remember_validity(self, valid: bool):
+        self._validity = valid
+        self._validity_key = self.value
+        self._validity_expires = min(time.time() + self.VALIDITY_TTL, self._expiration_timestamp)
 
     @property
     def is_valid(self):
-        url = 'https://api.linkedin.com/rest/adAccounts?q=search&search=(status:(values:List(ACTIVE)))'
-        headers = {
-            'Authorization': f'Bearer {self.value}',
-            'Linkedin-Version': '202305',
-            'X-Restli-Protocol-Version': '2.0.0'
-        }
-        response = requests.get(url, headers=headers)
+        valid = self.cached_validity
+        if valid is not None:
+            return valid
+        url = self.VALIDATION_URL
+        headers = dict(LINKEDIN_HEADERS, Authorization=f'Bearer {self.value}')
+        response = make_request(url, method='GET', headers=headers, raise_for_status=False)
+        self.remember_validity(response.status_code == 200)
         return response.status_code == 200
 
     def to_config_ini(self):
@@ -50,11 +117,32 @@ class LinkedInToken(Token):
         }
         return config
 
+    def to_dict(self) -> dict:
+        return {
+            'scope': self.scope,
+            'value': self.value,
+            'expiration_timestamp': self.expiration_timestamp,
+            'refresh_value': self.refresh_value,
+            'refresh_expiration_timestamp': self.refresh_expiration_timestamp
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LinkedInToken':
+        return cls(scope=data['scope'], value=data['value'], expiration_timestamp=data['expiration_timestamp'],
+                   refresh_value=data['refresh_value'], refresh_expiration_timestamp=data['refresh_expiration_timestamp'])
+
     def __repr__(self):
-        return f"LinkedInToken(value='{self.value}', expires_at='{self.expiration_timestamp}', refresh_token='{self.refresh_token.value}', refresh_token_expires_at='{self.refresh_token.expiration_timestamp}')"
+        return f"LinkedInToken(value='{self.value}', expires_at='{self.expiration_timestamp}', refresh_token='{self.refresh_value}', refresh_token_expires_at='{self.refresh_expiration_timestamp}')"
+
+    def update_from_refresh_response(self, response_data: dict):
+        now = time.time()
+        self.value = str(response_data['access_token'])
+        self.expiration_timestamp = float(now + response_data['expires_in'])
+        self.refresh_value = str(response_data['refresh_token'])
+        self.refresh_expiration_timestamp = float(now + response_data['refresh_token_expires_in'])
 
     def refresh_access_token(self, client_id, client_secret):
-        url = 'https://www.linkedin.com/oauth/v2/accessToken'
+        url = self.REFRESH_URL
 
         headers = {
             'Content-Type': 'application/x-www-form-urlencoded'
@@ -62,26 +150,20 @@ class LinkedInToken(Token):
 
         data = {
             'grant_type': 'refresh_token',
-            'refresh_token': self.refresh_token.value,
+            'refresh_token': self.refresh_value,
             'client_id': client_id,
             'client_secret': client_secret
         }
 
-        response = requests.post(url, headers=headers, data=data)
+        response = make_request(url, method='POST', headers=headers, data=data, raise_for_status=False)
 
         if response.status_code == 200:
-            response_data = response.json()
-
-            self.value = str(response_data['access_token'])
-            self.expiration_timestamp = float(time.time() + response_data['expires_in'])
-            self.refresh_token.value = str(response_data['refresh_token'])
-            self.refresh_token.expiration_timestamp = float(time.time() + response_data['refresh_token_expires_in'])
-
+            self.update_from_refresh_response(response.json())
         else:
             raise Exception(f'Failed to refresh access token. Status code: {response.status_code}')
 
     def revoke(self, client_id, client_secret):
-        revoke_url = f'https://api.linkedin.com/oauth/v2/revoke'
+        revoke_url = self.REVOKE_URL
         headers = {
             'Content-Type': 'application/x-www-form-urlencoded'
         }
@@ -92,12 +174,16 @@ class LinkedInToken(Token):
             'client_secret': client_secret,
             'token': self.value
         }
-        response = requests.post(revoke_url, headers=headers, data=data)
+        response = make_request(revoke_url, method='POST', headers=headers, data=data, raise_for_status=False)
         if response.status_code == 200:
             self.value = None
-            self.scope = None
+            self._scope = None
             self.expiration_timestamp = None
-            self.refresh_token = None
+            self.refresh_value = None
+            self.refresh_expiration_timestamp = None
+            self._validity = None
+            self._validity_key = None
+            self._validity_expires = 0.0
 
             return "Access token has been revoked successfully."
         else:
@@ -0,0 +1,255 @@
+"""
+This module manages many LinkedIn tokens and refreshes them before they expire.
+
+A `TokenManager` keeps the tokens of a `TokenStore` in memory and runs a background thread that
+refreshes every token some margin before its expiration and persists the result. Request hot
+paths only read the in-memory tokens, so they neither wait for a refresh nor use an expired token.
+A `TokenExpiryIndex` orders the tokens by expiration, so each check only visits the tokens that are due.
+"""
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from ..common.models.token import TokenExpiryIndex, get_clock_skew
+from .token import LinkedInToken
+from .token_store import TokenStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_MARGIN = 24 * 60 * 60
+DEFAULT_CHECK_INTERVAL = 60
+
+
+class TokenManager:
+    """
+    Holds the tokens of many members or accounts and refreshes them proactively.
+
+    Attributes:
+        store (TokenStore): The store the tokens are loaded from and saved to.
+        refresh_margin (float): Seconds before expiration at which a token is refreshed.
+        check_interval (float): Seconds between two checks of the background refresher.
+    """
+
+    def __init__(self, store: TokenStore, client_id: str, client_secret: str,
+                 refresh_margin: float = DEFAULT_REFRESH_MARGIN, check_interval: float = DEFAULT_CHECK_INTERVAL):
+        """
+        Initialize a new TokenManager and load every token of the store.
+
+        Args:
+            store (TokenStore): The store the tokens are loaded from and saved to.
+            client_id (str): The LinkedIn application's client id.
+            client_secret (str): The LinkedIn application's client secret.
+            refresh_margin (float): Seconds before expiration at which a token is refreshed.
+            check_interval (float): Seconds between two checks of the background refresher.
+        """
+        self.store = store
+        self.refresh_margin = refresh_margin
+        self.check_interval = check_interval
+        self.__client_id = client_id
+        self.__client_secret = client_secret
+        self._tokens: Dict[str, LinkedInToken] = store.load_all()
+        self._index = TokenExpiryIndex()
+        self._index_lock = threading.Lock()
+        for key, token in self._tokens.items():
+            self._index.add(key, token)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        """
+        Get the lock serializing refreshes of one token.
+
+        Args:
+            key (str): The member or account the token belongs to.
+
+        Returns:
+            threading.Lock: The token's lock.
+        """
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def add(self, key: str, token: LinkedInToken) -> None:
+        """
+        Add or replace a token and persist it.
+
+        Args:
+            key (str): The member or account the token belongs to.
+            token (LinkedInToken): The token.
+        """
+        self.store.put(key, token)
+        self._tokens[key] = token
+        with self._index_lock:
+            self._index.add(key, token)
+
+    def remove(self, key: str) -> None:
+        """
+        Forget a token and remove it from the store.
+
+        Args:
+            key (str): The member or account the token belongs to.
+        """
+        self._tokens.pop(key, None)
+        with self._index_lock:
+            self._index.remove(key)
+        self.store.delete(key)
+
+    def keys(self) -> List[str]:
+        """
+        List the members or accounts with a managed token.
+
+        Returns:
+            List[str]: The keys of the managed tokens.
+        """
+        return list(self._tokens)
+
+    def expiring_within(self, seconds: float) -> List[str]:
+        """
+        List the members or accounts whose token expires within a number of seconds.
+
+        Args:
+            seconds (float): The number of seconds from now.
+
+        Returns:
+            List[str]: The keys of those tokens, soonest expiration first.
+        """
+        with self._index_lock:
+            return self._index.expiring_within(seconds)
+
+    def get(self, key: str) -> LinkedInToken:
+        """
+        Get a token, refreshing it synchronously only if the background refresher fell behind.
+
+        Args:
+            key (str): The member or account the token belongs to.
+
+        Returns:
+            LinkedInToken: The token.
+
+        Raises:
+            KeyError: If there is no token for the key.
+            RuntimeError: If the token is expired and cannot be refreshed.
+        """
+        token = self._tokens[key]
+        if token.is_expired:
+            self.refresh(key)
+            if token.is_expired:
+                raise RuntimeError(f"The token of {key} is expired and cannot be refreshed; authorize again.")
+        return token
+
+    def access_token(self, key: str) -> str:
+        """
+        Get the current access token value of a member or account.
+
+        Args:
+            key (str): The member or account the token belongs to.
+
+        Returns:
+            str: The access token to send with requests.
+
+        Raises:
+            KeyError: If there is no token for the key.
+            RuntimeError: If the token is expired and cannot be refreshed.
+        """
+        return self.get(key).value
+
+    def needs_refresh(self, token: LinkedInToken, now: Optional[float] = None) -> bool:
+        """
+        Check whether a token is within the refresh margin and can still be refreshed.
+
+        Args:
+            token (LinkedInToken): The token to check.
+            now (float, optional): The current Unix timestamp.
+
+        Returns:
+            bool: True if the token should be refreshed now, False otherwise.
+        """
+        return token.expires_within(self.refresh_margin, now) and token.is_refreshable
+
+    def refresh(self, key: str) -> None:
+        """
+        Refresh a token if it is due and persist it. Concurrent calls for the same token refresh it once.
+
+        Args:
+            key (str): The member or account the token belongs to.
+        """
+        with self._lock_for(key):
+            token = self._tokens[key]
+            if not self.needs_refresh(token):
+                return
+            token.refresh_access_token(self.__client_id, self.__client_secret)
+            with self._index_lock:
+                self._index.add(key, token)
+            self.store.put(key, token)
+
+    def refresh_due(self) -> List[str]:
+        """
+        Refresh every token that is within the refresh margin.
+
+        Returns:
+            List[str]: The keys of the tokens that failed to refresh.
+        """
+        now = time.time()
+        with self._index_lock:
+            due = self._index.expiring_within(self.refresh_margin, now)
+        failed = []
+        for key in due:
+            token = self._tokens.get(key)
+            if token is None or not self.needs_refresh(token, now):
+                continue
+            try:
+                self.refresh(key)
+            except Exception as e:  # pylint: disable=broad-except
+                logger.error("Failed to refresh the token of %s: %s", key, e)
+                failed.append(key)
+        return failed
+
+    def _run(self) -> None:
+        """
+        Refresh due tokens until the manager is stopped.
+        """
+        while not self._stop.is_set():
+            self.refresh_due()
+            self._stop.wait(self._next_check())
+
+    def _next_check(self) -> float:
+        """
+        Get the seconds until the next token enters the refresh margin, capped by the check interval.
+        """
+        with self._index_lock:
+            upcoming = self._index.next_expiration()
+        if upcoming is None:
+            return self.check_interval
+        due_in = upcoming[1] - self.refresh_margin - get_clock_skew() - time.time()
+        return min(self.check_interval, max(due_in, 0.0)) or self.check_interval
+
+    def start(self) -> None:
+        """
+        Start the background refresher thread.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='echodata-token-refresher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the background refresher thread.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the thread to finish.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> 'TokenManager':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,344 @@
+"""
+This module defines stores that persist many LinkedIn tokens, keyed by member or ad account.
+
+The `TokenStore` base class describes the storage interface used by `TokenManager`. The
+`FileTokenStore` keeps all tokens in one JSON file that is updated under an inter-process file
+lock and replaced atomically, so concurrent writers never lose updates or leave a torn file.
+The `SQLiteTokenStore` keeps one row per token in a WAL-mode sqlite database, so saving a token
+is a single upsert however many tokens are stored. `import_tokens` and `export_tokens` move
+tokens between any store and the JSON and INI formats.
+"""
+import configparser
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..common.files import atomic_write, file_lock
+from .token import LinkedInToken
+
+
+class TokenStore(ABC):
+    """
+    Abstract base class for a persistent, concurrency-safe collection of LinkedIn tokens.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[LinkedInToken]:
+        """
+        Load a token.
+
+        Args:
+            key (str): The member or account the token belongs to.
+
+        Returns:
+            LinkedInToken: The stored token, or None if there is none.
+        """
+
+    @abstractmethod
+    def put(self, key: str, token: LinkedInToken) -> None:
+        """
+        Insert or replace a token.
+
+        Args:
+            key (str): The member or account the token belongs to.
+            token (LinkedInToken): The token to store.
+        """
+
+    def put_many(self, tokens: Dict[str, LinkedInToken]) -> None:
+        """
+        Insert or replace several tokens.
+
+        Args:
+            tokens (Dict[str, LinkedInToken]): The tokens keyed by member or account.
+        """
+        for key, token in tokens.items():
+            self.put(key, token)
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Remove a token if it exists.
+
+        Args:
+            key (str): The member or account the token belongs to.
+        """
+
+    @abstractmethod
+    def load_all(self) -> Dict[str, LinkedInToken]:
+        """
+        Load every stored token.
+
+        Returns:
+            Dict[str, LinkedInToken]: The tokens keyed by member or account.
+        """
+
+    def keys(self) -> List[str]:
+        """
+        List the keys of the stored tokens.
+
+        Returns:
+            List[str]: The members or accounts that have a token.
+        """
+        return list(self.load_all())
+
+
+class FileTokenStore(TokenStore):
+    """
+    A token store kept in a single JSON file.
+
+    Attributes:
+        filepath (str): The path of the JSON file.
+    """
+
+    def __init__(self, filepath: str):
+        """
+        Initialize a new FileTokenStore.
+
+        Args:
+            filepath (str): The path of the JSON file. It is created on the first write.
+        """
+        self.filepath = filepath
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, dict]:
+        """
+        Read the raw token data from the file.
+
+        Returns:
+            Dict[str, dict]: The serialized tokens keyed by member or account.
+        """
+        if not os.path.exists(self.filepath):
+            return {}
+        with open(self.filepath, 'r') as json_file:
+            return json.load(json_file)
+
+    def _update(self, changes: Dict[str, Optional[dict]]) -> None:
+        """
+        Replace or remove tokens under the file lock and write the file atomically.
+
+        Args:
+            changes (Dict[str, Optional[dict]]): The serialized tokens keyed by member or account, or None to remove one.
+        """
+        with self._lock, file_lock(self.filepath):
+            tokens = self._read()
+            changed = False
+            for key, data in changes.items():
+                if data is None:
+                    changed = tokens.pop(key, None) is not None or changed
+                else:
+                    tokens[key] = data
+                    changed = True
+            if changed:
+                atomic_write(self.filepath, json.dumps(tokens, indent=4))
+
+    def get(self, key: str) -> Optional[LinkedInToken]:
+        data = self._read().get(key)
+        return LinkedInToken.from_dict(data) if data is not None else None
+
+    def put(self, key: str, token: LinkedInToken) -> None:
+        self._update({key: token.to_dict()})
+
+    def put_many(self, tokens: Dict[str, LinkedInToken]) -> None:
+        self._update({key: token.to_dict() for key, token in tokens.items()})
+
+    def delete(self, key: str) -> None:
+        self._update({key: None})
+
+    def load_all(self) -> Dict[str, LinkedInToken]:
+        return {key: LinkedInToken.from_dict(data) for key, data in self._read().items()}
+
+
+class SQLiteTokenStore(TokenStore):
+    """
+    A token store kept in a sqlite database with one row per token.
+
+    The database runs in WAL mode, so readers never block the writer and a crash mid-write leaves
+    the previous version of every token intact. Several processes may share the database.
+
+    Attributes:
+        path (str): The path of the sqlite database file.
+    """
+    COLUMNS = ('scope', 'value', 'expiration_timestamp', 'refresh_value', 'refresh_expiration_timestamp')
+
+    def __init__(self, path: str, timeout: float = 30):
+        """
+        Initialize a new SQLiteTokenStore, creating the database if needed.
+
+        Args:
+            path (str): The path of the sqlite database file.
+            timeout (float): Seconds to wait for another process holding the write lock.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS tokens (key TEXT PRIMARY KEY, scope TEXT, value TEXT, '
+            'expiration_timestamp REAL, refresh_value TEXT, refresh_expiration_timestamp REAL, updated_at REAL)'
+        )
+
+    @staticmethod
+    def _row(key: str, token: LinkedInToken) -> Tuple:
+        return (key, token.scope, token.value, token.expiration_timestamp, token.refresh_value,
+                token.refresh_expiration_timestamp, time.time())
+
+    @staticmethod
+    def _token(row: Tuple) -> LinkedInToken:
+        return LinkedInToken(*row)
+
+    def _upsert(self, rows: Iterable[Tuple]) -> None:
+        """
+        Insert or replace token rows in one transaction.
+
+        Args:
+            rows (Iterable[Tuple]): The rows to write.
+        """
+        with self._lock:
+            self._connection.execute('BEGIN IMMEDIATE')
+            try:
+                self._connection.executemany(
+                    'INSERT INTO tokens VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET '
+                    'scope = excluded.scope, value = excluded.value, '
+                    'expiration_timestamp = excluded.expiration_timestamp, refresh_value = excluded.refresh_value, '
+                    'refresh_expiration_timestamp = excluded.refresh_expiration_timestamp, '
+                    'updated_at = excluded.updated_at', rows
+                )
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+            self._connection.execute('COMMIT')
+
+    def get(self, key: str) -> Optional[LinkedInToken]:
+        with self._lock:
+            row = self._connection.execute(
+                f'SELECT {", ".join(self.COLUMNS)} FROM tokens WHERE key = ?', (key,)
+            ).fetchone()
+        return self._token(row) if row is not None else None
+
+    def put(self, key: str, token: LinkedInToken) -> None:
+        self._upsert([self._row(key, token)])
+
+    def put_many(self, tokens: Dict[str, LinkedInToken]) -> None:
+        self._upsert([self._row(key, token) for key, token in tokens.items()])
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM tokens WHERE key = ?', (key,))
+
+    def load_all(self) -> Dict[str, LinkedInToken]:
+        with self._lock:
+            rows = self._connection.execute(f'SELECT key, {", ".join(self.COLUMNS)} FROM tokens').fetchall()
+        return {row[0]: self._token(row[1:]) for row in rows}
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._connection.execute('SELECT key FROM tokens')]
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection.
+        """
+        self._connection.close()
+
+
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+
+def open_token_store(path: str) -> TokenStore:
+    """
+    Open the token store at a path, choosing the backend by its file extension.
+
+    Args:
+        path (str): The path of the store. Paths ending in .db, .sqlite or .sqlite3 open a
+            `SQLiteTokenStore`, any other path a `FileTokenStore`.
+
+    Returns:
+        TokenStore: The opened store.
+    """
+    if path.lower().endswith(SQLITE_SUFFIXES):
+        return SQLiteTokenStore(path)
+    return FileTokenStore(path)
+
+
+def _read_ini(filepath: str, key: Optional[str]) -> Dict[str, LinkedInToken]:
+    """
+    Read tokens from an INI file.
+
+    Files written by `LinkedInToken.save_to_config_ini` hold a single token in the 'LinkedIn Token'
+    and 'LinkedIn Refresh Token' sections. Files written by `export_tokens` hold one section per key.
+
+    Args:
+        filepath (str): The path of the INI file.
+        key (str, optional): The key to store a single-token file under.
+
+    Returns:
+        Dict[str, LinkedInToken]: The tokens keyed by member or account.
+
+    Raises:
+        ValueError: If the file holds a single token and no key was given.
+    """
+    config = configparser.ConfigParser(interpolation=None)
+    config.read(filepath)
+    if config.has_section('LinkedIn Token'):
+        if key is None:
+            raise ValueError(f"{filepath} holds a single token; pass the key to store it under.")
+        token, refresh = config['LinkedIn Token'], config['LinkedIn Refresh Token']
+        return {key: LinkedInToken(token['scope'], token['value'], token['expiration_timestamp'],
+                                   refresh['value'], refresh['expiration_timestamp'])}
+    return {section: LinkedInToken.from_dict(config[section]) for section in config.sections()}
+
+
+def import_tokens(store: TokenStore, filepath: str, key: Optional[str] = None) -> int:
+    """
+    Import tokens from a JSON or INI file into a store.
+
+    JSON files use the format of `FileTokenStore`. INI files are either written by `export_tokens`
+    or by `LinkedInToken.save_to_config_ini`.
+
+    Args:
+        store (TokenStore): The store to import into.
+        filepath (str): The path of the JSON or INI file.
+        key (str, optional): The key to store a single-token INI file under.
+
+    Returns:
+        int: The number of imported tokens.
+    """
+    if filepath.lower().endswith('.ini'):
+        tokens = _read_ini(filepath, key)
+    else:
+        tokens = FileTokenStore(filepath).load_all()
+    store.put_many(tokens)
+    return len(tokens)
+
+
+def export_tokens(store: TokenStore, filepath: str) -> int:
+    """
+    Export every token of a store to a JSON or INI file, replacing the file atomically.
+
+    Args:
+        store (TokenStore): The store to export.
+        filepath (str): The path of the file. Paths ending in .ini are written as INI with one
+            section per key, any other path as JSON in the format of `FileTokenStore`.
+
+    Returns:
+        int: The number of exported tokens.
+    """
+    tokens = store.load_all()
+    if filepath.lower().endswith('.ini'):
+        config = configparser.ConfigParser(interpolation=None)
+        for key, token in tokens.items():
+            config[key] = {name: str(value) for name, value in token.to_dict().items()}
+        buffer = io.StringIO()
+        config.write(buffer)
+        with file_lock(filepath):
+            atomic_write(filepath, buffer.getvalue())
+    else:
+        with file_lock(filepath):
+            atomic_write(filepath, json.dumps({key: token.to_dict() for key, token in tokens.items()}, indent=4))
+    return len(tokens)
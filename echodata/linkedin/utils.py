@@ -1,64 +1,189 @@
-from typing import Any, Dict, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence
 
-from ..common.utils import make_request, retry
+from ..common.cache import ResponseCache, cache_key
+from ..common.decode import decode_page
+from ..common.metrics import emit
+from ..common.ratelimit import get_rate_limiter
+from ..common.utils import make_request, request_exceptions, retry, set_host_concurrency
+from .constants import LINKEDIN_API_HOST, LINKEDIN_API_URL, LINKEDIN_HEADERS, LINKEDIN_OAUTH_URL  # pylint: disable=unused-import
+from .projection import linkedin_projection
+from .restli import encode_query
 
+DEFAULT_HOST_CONCURRENCY = 8
 
-@retry(max_retries=3, delay=2, exceptions=(TimeoutError, ConnectionError))
-def linkedin_get_request(endpoint: str, access_token: str, params: Optional[Dict[str, Any]] = None) -> Any:
+set_host_concurrency(LINKEDIN_API_HOST, DEFAULT_HOST_CONCURRENCY)
+
+
+@retry(max_retries=3, delay=2, exceptions=request_exceptions)
+def linkedin_get_request(endpoint: str, access_token: str, params: Optional[Dict[str, Any]] = None,
+                         cache: Optional[ResponseCache] = None, fields: Optional[Sequence[str]] = None) -> Any:
     """
     Send a GET request to the LinkedIn API.
 
+    Dictionary parameters are encoded with the Rest.li 2.0 syntax, see `restli.encode_query`.
+    Every attempt first waits for the shared rate limiter, with the access token as member key.
+    With a cache, fresh cached responses are returned without a request, and stale ones are
+    revalidated with their ETag. With `fields`, only those fields are requested, see
+    `projection.linkedin_projection`.
+
     Args:
         endpoint (str): The API endpoint to be appended to the base URL.
         access_token (str): The OAuth access token for LinkedIn API authentication.
-        params (Dict[str, Any], optional): URL parameters to append to the request.
+        params (Dict[str, Any], optional): URL parameters to append to the request, or an encoded query string.
+        cache (ResponseCache, optional): The cache to serve and store the response with.
+        fields (Sequence[str], optional): Dotted paths of the fields to return, e.g. ['id', 'dailyBudget.amount'].
 
     Returns:
         Any: The parsed JSON response from the LinkedIn API.
 
     Raises:
-        TimeoutError, ConnectionError: For network-related issues, handled with retries.
-        HTTPError: For unsuccessful HTTP responses.
+        ValueError: If a field is unknown for the endpoint.
+        Timeout, ConnectionError: For network-related issues, handled with retries.
+        HTTPError: For unsuccessful HTTP responses; throttling and server errors are retried.
     """
-    base_url = 'https://api.linkedin.com/rest'
-    url = f'{base_url}{endpoint}'
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'Linkedin-Version': '202305',
-        'X-Restli-Protocol-Version': '2.0.0'
-    }
+    url = f'{LINKEDIN_API_URL}{endpoint}'
+    if fields:
+        projection = {'fields': linkedin_projection(endpoint, fields)}
+        if isinstance(params, str):
+            params = f'{params}&{encode_query(projection)}' if params else encode_query(projection)
+        else:
+            params = dict(params or {}, **projection)
+    headers = dict(LINKEDIN_HEADERS, Authorization=f'Bearer {access_token}')
 
-    return make_request(url=url, method='GET', headers=headers, params=params)
+    key = entry = None
+    if cache is not None:
+        key = cache_key(url, params, access_token)
+        entry = cache.get(key)
+        if entry is not None and entry.is_fresh:
+            return entry.to_response()
+        if entry is not None and entry.etag:
+            headers['If-None-Match'] = entry.etag
 
+    get_rate_limiter().acquire(member=access_token)
+    query = encode_query(params) if isinstance(params, dict) else params
+    response = make_request(url=url, method='GET', headers=headers, params=query)
+    if cache is not None:
+        response = cache.store(key, response, previous=entry)
+    return response
 
-def linkedin_paginated_request(endpoint: str, access_token: str, params: dict, max_count: int = 1000) -> List[Any]:
+
+def _get_page(endpoint: str, access_token: str, params: Dict[str, Any], start: int, count: int,
+              record_type: Optional[type] = None, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
     """
-    Make paginated GET requests to the LinkedIn API.
+    Fetch a single page of a paginated LinkedIn API collection.
+
+    Args:
+        endpoint (str): The API endpoint to be appended to the base URL.
+        access_token (str): The OAuth access token for LinkedIn API authentication.
+        params (Dict[str, Any]): URL parameters shared by every page.
+        start (int): The offset of the first element of the page.
+        count (int): The number of elements to request.
+        record_type (type, optional): A type created by `make_record_type` to decode the elements into.
+        fields (Sequence[str], optional): Dotted paths of the element fields to return.
+
+    Returns:
+        Dict[str, Any]: The decoded page, including its `elements` and `paging` fields.
+    """
+    page_params = dict(params, start=start, count=count)
+    response = linkedin_get_request(endpoint, access_token, params=page_params, fields=fields)
+    page = decode_page(response.content, record_type)
+    emit('page', endpoint=endpoint, start=start, elements=len(page.get("elements", [])))
+    return page
+
+
+def iter_linkedin_pages(endpoint: str, access_token: str, params: dict, max_count: int = 1000, start: int = 0,
+                       max_workers: int = 1, record_type: Optional[type] = None,
+                       fields: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily fetch the pages of a paginated LinkedIn API collection.
+
+    Pages are yielded as soon as they arrive and in offset order, so a consumer only needs
+    to hold one page at a time. With `max_workers` greater than one, at most `max_workers`
+    pages are fetched ahead of the consumer.
 
     Args:
-        base_url (str): The base URL for the LinkedIn API endpoint.
+        endpoint (str): The API endpoint to be appended to the base URL.
         access_token (str): The OAuth access token for LinkedIn API authentication.
         params (dict): Initial URL parameters for the request.
         max_count (int): Maximum number of items to retrieve per request.
+        start (int): The offset to start from, e.g. to resume an interrupted download.
+        max_workers (int): Number of pages to fetch concurrently.
+        record_type (type, optional): A type created by `make_record_type` to decode the elements into.
+        fields (Sequence[str], optional): Dotted paths of the element fields to return, e.g. ['id', 'name'].
 
-    Returns:
-        List[Any]: A list of all items retrieved from the paginated API responses.
+    Yields:
+        Dict[str, Any]: The decoded pages, including their `elements` and `paging` fields.
     """
-    start = 0
-    elements = []
+    data = _get_page(endpoint, access_token, params, start, max_count, record_type, fields)
+    total = data.get("paging", {}).get("total", 0)
+    yield data
+    offsets = range(start + max_count, total, max_count)
 
-    while True:
-        params['start'] = start
-        params['count'] = max_count
-        response = linkedin_get_request(endpoint, access_token, params=params)
-        data = response.json()
-        elements.extend(data.get("elements", []))
+    if max_workers <= 1:
+        for offset in offsets:
+            yield _get_page(endpoint, access_token, params, offset, max_count, record_type, fields)
+        return
 
-        paging = data.get("paging", {})
-        total = paging.get("total", 0)
-        start += max_count
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Deque[Future] = deque()
+        for offset in offsets:
+            pending.append(executor.submit(_get_page, endpoint, access_token, params, offset, max_count, record_type,
+                                           fields))
+            if len(pending) >= max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
 
-        if start >= total:
-            break
 
-    return elements
+def iter_linkedin_elements(endpoint: str, access_token: str, params: dict, max_count: int = 1000, start: int = 0,
+                          max_workers: int = 1, record_type: Optional[type] = None,
+                          fields: Optional[Sequence[str]] = None) -> Iterator[Any]:
+    """
+    Lazily yield the elements of a paginated LinkedIn API collection.
+
+    Args:
+        endpoint (str): The API endpoint to be appended to the base URL.
+        access_token (str): The OAuth access token for LinkedIn API authentication.
+        params (dict): Initial URL parameters for the request.
+        max_count (int): Maximum number of items to retrieve per request.
+        start (int): The offset to start from, e.g. to resume an interrupted download.
+        max_workers (int): Number of pages to fetch concurrently.
+        record_type (type, optional): A type created by `make_record_type` to decode the elements into.
+        fields (Sequence[str], optional): Dotted paths of the element fields to return, e.g. ['id', 'name'].
+
+    Yields:
+        Any: The elements of every page, in offset order.
+    """
+    for page in iter_linkedin_pages(endpoint, access_token, params, max_count=max_count, start=start,
+                                    max_workers=max_workers, record_type=record_type, fields=fields):
+        yield from page.get("elements", [])
+
+
+def linkedin_paginated_request(endpoint: str, access_token: str, params: dict, max_count: int = 1000,
+                               max_workers: int = 1, record_type: Optional[type] = None,
+                               fields: Optional[Sequence[str]] = None) -> List[Any]:
+    """
+    Make paginated GET requests to the LinkedIn API.
+
+    The first page is always fetched on its own to learn `paging.total`. With `max_workers`
+    greater than one, the remaining offsets are then fetched by a pool of worker threads;
+    pages are still returned in offset order. The number of requests actually in flight is
+    further bounded by the per-host cap set with `set_host_concurrency`. Use
+    `iter_linkedin_elements` to process elements without holding the whole collection in memory.
+
+    Args:
+        endpoint (str): The API endpoint to be appended to the base URL.
+        access_token (str): The OAuth access token for LinkedIn API authentication.
+        params (dict): Initial URL parameters for the request.
+        max_count (int): Maximum number of items to retrieve per request.
+        max_workers (int): Number of pages to fetch concurrently.
+        record_type (type, optional): A type created by `make_record_type` to decode the elements into.
+        fields (Sequence[str], optional): Dotted paths of the element fields to return, e.g. ['id', 'name'].
+
+    Returns:
+        List[Any]: A list of all items retrieved from the paginated API responses.
+    """
+    return list(iter_linkedin_elements(endpoint, access_token, params, max_count=max_count, max_workers=max_workers,
+                                       record_type=record_type, fields=fields))
@@ -5,9 +5,18 @@ setup(
     version='0.1',
     packages=find_packages(),
     install_requires=[
-        "requests",
-        "pandas"
+        "requests"
     ],
+    extras_require={
+        "pandas": ["pandas"],
+        "async": ["httpx"],
+        "arrow": ["pyarrow"],
+        "fast": ["orjson", "msgspec"],
+        "all": ["pandas", "httpx", "pyarrow", "orjson", "msgspec"]
+    },
+    entry_points={
+        "console_scripts": ["echodata=echodata.cli:main"]
+    },
     author='Erfan Yazdpour',
     author_email='e.yazdpour@gmail.com',
     description='A comprehensive data export tool for analyzing and reporting campaign performance across various marketing platforms',